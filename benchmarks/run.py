@@ -0,0 +1,146 @@
+"""
+Micro-benchmarks for the LLM output parsers, the prompt builders and the
+console report generator on synthetic data.
+
+    python -m benchmarks.run                  # compare against benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline  # record a new baseline
+    python -m benchmarks.run --quick          # small sizes only
+
+Exits with status 1 when any case is slower than its baseline by more than
+--threshold (a fraction, default 0.25). Timings are only comparable on the
+machine the baseline was recorded on: when the Python version or platform
+differs, the comparison is printed as a warning and the gate is skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime
+
+from benchmarks.synthetic import RESPONSE_SHAPES, synthetic_llm_output, synthetic_milestone
+from llm_agent.prompt_builders import build_commit_prompt, build_pr_prompt, build_milestone_prompt
+from utils.data_parser import parse_llm_commit_analysis, parse_llm_pr_analysis, parse_llm_milestone_analysis
+from utils.report_generator import generate_console_report
+from utils.scheduler import iter_pull_requests
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+MILESTONE_SIZES = (10, 100, 1000, 10000)
+QUICK_MILESTONE_SIZES = (10, 100)
+
+PARSERS = {
+    "commit": parse_llm_commit_analysis,
+    "pr": parse_llm_pr_analysis,
+    "milestone": parse_llm_milestone_analysis
+}
+
+
+def build_cases(sizes):
+    """
+    Returns a dict of case name -> zero-argument callable.
+    """
+    cases = {}
+    for kind, parser in PARSERS.items():
+        for shape in RESPONSE_SHAPES:
+            text = synthetic_llm_output(kind, shape)
+            cases[f"parse_{kind}[{shape}]"] = lambda parser=parser, text=text: parser(text)
+
+    # A commit prompt only depends on its own commit, not on the milestone size.
+    first_commit = next(iter_pull_requests(synthetic_milestone(min(sizes))["issues"])).commits[0]
+    cases["build_commit_prompt"] = lambda c=first_commit: build_commit_prompt(c.message, c.diff, "Review by r (COMMENTED): ok")
+
+    for size in sizes:
+        data = synthetic_milestone(size)
+        prs = list(iter_pull_requests(data["issues"]))
+
+        cases[f"build_pr_prompts[{size}]"] = lambda prs=prs: [
+            build_pr_prompt(pr.title, pr.description, pr.commits, pr.reviews, pr.comments) for pr in prs
+        ]
+        cases[f"build_milestone_prompt[{size}]"] = lambda data=data: build_milestone_prompt(data["milestone_title"], data["issues"])
+        cases[f"generate_console_report[{size}]"] = lambda data=data: generate_console_report(data)
+    return cases
+
+
+def time_case(fn, repeat):
+    """
+    Best-of-`repeat` seconds per call, with the loop count calibrated by timeit.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints a comparison table and returns the names of regressed cases.
+    """
+    regressions = []
+    print(f"\n{'case':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>12} {seconds * 1e3:>10.3f}ms {'new':>9}")
+            continue
+        change = (seconds - base) / base if base else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {base * 1e3:>10.3f}ms {seconds * 1e3:>10.3f}ms {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsers, prompt builders and the report generator.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (best is kept).")
+    parser.add_argument("--quick", action="store_true", help="Only benchmark the small milestone sizes.")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string.")
+    args = parser.parse_args()
+
+    sizes = QUICK_MILESTONE_SIZES if args.quick else MILESTONE_SIZES
+    print(f"Building synthetic data for milestone sizes {sizes}...")
+    cases = {name: fn for name, fn in build_cases(sizes).items() if args.filter in name}
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = time_case(fn, args.repeat)
+        print(f"  {name:<40} {results[name] * 1e3:>10.3f}ms")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results
+            }, f, indent=4)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline found at {args.baseline}. Run with --save-baseline first.")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], args.threshold)
+    environment = (platform.python_version(), platform.platform())
+    recorded = (baseline.get("python"), baseline.get("platform"))
+    if environment != recorded:
+        print(f"\nWarning: the baseline was recorded with Python {recorded[0]} on {recorded[1]}, "
+              f"this run used Python {environment[0]} on {environment[1]}. Timings are not comparable, "
+              "so the regression gate is skipped. Record a baseline on this machine with --save-baseline.")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Synthetic data for the benchmark suite: LLM responses in the formats the
+parsers expect (including pathological, very long ones) and milestone trees
+of utils.models records with a given number of commits.
+"""
+import random
+
+from utils.diff_store import DiffStore
+from utils.models import IssueRecord, PullRequestRecord, CommitRecord, ReviewRecord, CommentRecord
+
+SCORE_HEADERS = {
+    "commit": "Confidence Score",
+    "pr": "Release Readiness Score",
+    "milestone": "Release Confidence Score"
+}
+
+RESPONSE_SHAPES = ("normal", "long", "pathological")
+
+WORDS = (
+    "the change handles null input correctly but lacks unit tests for the error path "
+    "resource cleanup is done in a finally block and naming follows conventions "
+    "consider extracting the retry logic into a helper to reduce complexity"
+).split()
+
+COMMITS_PER_PR = 5
+PRS_PER_ISSUE = 2
+
+
+def _sentence(rng, words=15):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_llm_output(kind, shape="normal", seed=0):
+    """
+    Returns an LLM response for `kind` ("commit", "pr" or "milestone").
+
+    - normal: a score, a short justification and a few bullet points
+    - long: a ~50 KB justification and 200 bullet points
+    - pathological: a ~200 KB multi-line justification with no improvements
+      header, many lines starting with capitals and near-miss headers, which
+      forces the lookahead regexes to scan to the end of the text
+    """
+    rng = random.Random(seed)
+    score = rng.randint(0, 100)
+    header = f"{SCORE_HEADERS[kind]}: {score}\n"
+
+    if shape == "normal":
+        justification = " ".join(_sentence(rng) for _ in range(4))
+        bullets = "\n".join(f"- {_sentence(rng, 10)}" for _ in range(4))
+        return f"{header}Justification: {justification}\nActionable Improvements:\n{bullets}\n"
+
+    if shape == "long":
+        justification = "\n".join(_sentence(rng) for _ in range(500))
+        bullets = "\n".join(f"- {_sentence(rng, 12)}" for _ in range(200))
+        return f"{header}Justification: {justification}\n\nActionable Improvements:\n{bullets}\n"
+
+    if shape == "pathological":
+        lines = []
+        for i in range(2000):
+            lines.append(_sentence(rng))
+            if i % 50 == 0:
+                lines.append("Actionable Improvement - see above")
+            if i % 7 == 0:
+                lines.append(f"- not a real bullet {i}")
+        return f"{header}Justification: " + "\n".join(lines) + "\n"
+
+    raise ValueError(f"Unknown response shape: {shape}")
+
+
+def _synthetic_diff(rng, lines):
+    body = "".join(f"+    {_sentence(rng, 8)}\n" for _ in range(lines))
+    return f"--- a/src/Main.java\n+++ b/src/Main.java\n@@ -1,{lines} +1,{lines} @@\n{body}"
+
+
+def synthetic_milestone(commit_count, seed=0, diff_store=None):
+    """
+    Builds an analyzed milestone results dict (the shape main() produces)
+    with `commit_count` commits spread over issues and PRs.
+    """
+    rng = random.Random(seed)
+    diff_store = diff_store or DiffStore()
+    issues = {}
+    commits_left = commit_count
+    pr_number = 1000
+
+    issue_number = 1
+    while commits_left > 0:
+        issue = IssueRecord(issue_number, f"Issue {issue_number}", f"https://example.com/issues/{issue_number}", "open")
+        issue.comments.append(CommentRecord("dev", _sentence(rng, 30)))
+
+        for _ in range(PRS_PER_ISSUE):
+            if commits_left <= 0:
+                break
+            pr_number += 1
+            pr = PullRequestRecord(pr_number, f"PR {pr_number}", f"https://example.com/pull/{pr_number}",
+                                   rng.choice(["open", "closed"]), "dev", _sentence(rng, 40))
+            for _ in range(min(COMMITS_PER_PR, commits_left)):
+                commit = CommitRecord(f"{rng.getrandbits(160):040x}", f"{_sentence(rng, 6)}\n\n{_sentence(rng)}",
+                                      "dev", "2025-07-01T00:00:00+00:00", _synthetic_diff(rng, rng.randint(20, 400)),
+                                      [f"src/module{rng.randint(0, 20)}/Main.java"], diff_store)
+                commit.llm_analysis = {
+                    "confidence_score": rng.randint(0, 100),
+                    "justification": " ".join(_sentence(rng) for _ in range(3)),
+                    "actionable_improvements": [_sentence(rng, 10) for _ in range(3)]
+                }
+                commit.analysis_status = "analyzed"
+                pr.commits.append(commit)
+                commits_left -= 1
+            pr.reviews.append(ReviewRecord("reviewer", "COMMENTED", _sentence(rng, 40)))
+            pr.comments.append(CommentRecord("dev", _sentence(rng, 20)))
+            pr.llm_pr_analysis = {
+                "release_readiness_score": rng.randint(0, 100),
+                "justification": " ".join(_sentence(rng) for _ in range(4)),
+                "actionable_improvements": [_sentence(rng, 10) for _ in range(3)]
+            }
+            pr.analysis_status = "analyzed"
+            issue.associated_prs[pr.number] = pr
+
+        issues[issue.number] = issue
+        issue_number += 1
+
+    return {
+        "milestone_title": f"Synthetic-{commit_count}",
+        "issues": issues,
+        "llm_milestone_analysis": {
+            "release_confidence_score": rng.randint(0, 100),
+            "justification": " ".join(_sentence(rng) for _ in range(6)),
+            "actionable_improvements": [_sentence(rng, 10) for _ in range(4)]
+        },
+        "coverage": {}
+    }
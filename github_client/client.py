@@ -1,4 +1,5 @@
 import os
+import re
 from github import Github
 from dotenv import load_dotenv
 
@@ -69,34 +70,79 @@ class GitHubClient:
                 prs.append(pr)
         return prs
 
+    def get_linked_pull_requests(self, issue_number, issue_comments):
+        """
+        Finds PRs linked to an issue: PR URLs in its comments first, then PRs
+        whose title or body reference the issue number. Each PR appears once.
+        """
+        linked_prs = []
+        seen_pr_numbers = set()
+
+        for comment in issue_comments:
+            pr_url_match = re.search(r'https://github\.com/[^/]+/[^/]+/pull/(\d+)', comment.body)
+            if pr_url_match:
+                pr_number_from_comment = int(pr_url_match.group(1))
+                if pr_number_from_comment not in seen_pr_numbers:
+                    pr_from_comment = self.get_pull_request_details(pr_number_from_comment)
+                    if pr_from_comment:
+                        linked_prs.append(pr_from_comment)
+                        seen_pr_numbers.add(pr_number_from_comment)
+
+        for pr in self.get_pull_requests_referencing_issue(issue_number):
+            if pr.number not in seen_pr_numbers:
+                linked_prs.append(pr)
+                seen_pr_numbers.add(pr.number)
+        return linked_prs
+
     def get_reviews_for_pull_request(self, pr):
         reviews = pr.get_reviews()
         print(f"  Fetching reviews for PR #{pr.number}...")
         print(f"  Found {reviews.totalCount} reviews for PR #{pr.number}.")
         return list(reviews)
 
-    def get_commits_for_pull_request(self, pr):
+    def get_review_comments_for_pull_request(self, pr):
+        """
+        Fetches the inline review comments on a Pull Request (comments attached to
+        a commit, file and line of the diff), in one pass for the whole PR.
+        """
+        print(f"  Fetching inline review comments for PR #{pr.number}...")
+        comments = list(pr.get_review_comments())
+        print(f"  Found {len(comments)} inline review comments for PR #{pr.number}.")
+        return comments
+
+    def get_commits_for_pull_request(self, pr, skip_shas=()):
         """
         Fetches commits for a pull request, ensuring the full diff (patch) is available.
         Returns a list of dictionaries, where each dict represents a detailed commit.
+        Commits whose SHA is in `skip_shas` (already fetched for another PR) are
+        returned as {"sha": ...} only, without fetching their details again.
         """
         raw_commits = pr.get_commits()
         detailed_commits = []
         print(f"  Fetching commits for PR #{pr.number}...")
 
         for commit_summary in raw_commits:
+            if commit_summary.sha in skip_shas:
+                detailed_commits.append({"sha": commit_summary.sha})
+                continue
             try:
                 full_commit = self.repo.get_commit(commit_summary.sha)
                 
                 diff_content = ""
+                changed_files = []
                 # full_commit.files is a list of File objects, each having a .patch attribute
                 if full_commit.files:
                     for file_change in full_commit.files:
+                        changed_files.append(file_change.filename)
                         if file_change.patch: # Directly access the .patch attribute
                             # Reconstruct diff header for each file for better readability
                             diff_content += f"--- a/{file_change.previous_filename or file_change.filename}\n"
                             diff_content += f"+++ b/{file_change.filename}\n"
                             diff_content += file_change.patch + "\n"
+                        elif file_change.status == "renamed" and not file_change.changes:
+                            # Pure renames have no patch; keep the header so the rename is visible in the diff
+                            diff_content += f"--- a/{file_change.previous_filename}\n"
+                            diff_content += f"+++ b/{file_change.filename}\n"
                 
                 if not diff_content:
                     diff_content = "No relevant diff available for this commit (e.g., merge commit or no file changes)."
@@ -106,7 +152,8 @@ class GitHubClient:
                     "message": full_commit.commit.message,
                     "author": full_commit.commit.author.name,
                     "date": full_commit.commit.author.date.isoformat(),
-                    "diff": diff_content 
+                    "diff": diff_content,
+                    "files": changed_files
                 }
                 detailed_commits.append(commit_data)
             except Exception as e:
@@ -116,7 +163,8 @@ class GitHubClient:
                     "message": commit_summary.commit.message,
                     "author": commit_summary.commit.author.name,
                     "date": commit_summary.commit.author.date.isoformat(),
-                    "diff": "Error fetching detailed diff: " + str(e) # Include error message for debugging
+                    "diff": "Error fetching detailed diff: " + str(e), # Include error message for debugging
+                    "files": []
                 })
         print(f"  Found {len(detailed_commits)} commits for PR #{pr.number}.")
         return detailed_commits
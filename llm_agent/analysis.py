@@ -1,9 +1,10 @@
 import google.generativeai as genai
 import os
+import time
 from dotenv import load_dotenv
-from llm_agent.prompts import COMMIT_ANALYSIS_PROMPT
-from llm_agent.prompts import PR_ANALYSIS_PROMPT
-from llm_agent.prompts import MILESTONE_ANALYSIS_PROMPT
+from llm_agent.prompt_builders import build_commit_prompt, build_pr_prompt, build_milestone_prompt
+from llm_agent.resilience import ResilientCaller
+from llm_agent.streaming import OutputLimits, StreamStats, consume_stream, DEFAULT_MAX_OUTPUT_TOKENS
 
 # Load environment variables
 load_dotenv()
@@ -18,144 +19,110 @@ genai.configure(api_key=GEMINI_API_KEY)
 # Initialize the Generative Model
 model = genai.GenerativeModel('gemini-1.5-flash-latest') # Or 'gemini-1.5-flash-latest' if you prefer a faster/cheaper option
 
-def analyze_commit_with_llm(commit_message, commit_diff, review_comments=""):
+# Retries, hedging and circuit breaking for every LLM call; see llm_agent/resilience.py
+llm_caller = ResilientCaller.from_env()
+
+# Streamed responses with early cutoff and per-prompt-type output limits; see llm_agent/streaming.py
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() in ("1", "true", "yes")
+output_limits = {kind: OutputLimits.from_env(kind) for kind in DEFAULT_MAX_OUTPUT_TOKENS}
+stream_stats = StreamStats()
+
+
+def _chunk_texts(response):
+    for chunk in response:
+        if chunk.candidates and chunk.candidates[0].content.parts:
+            yield "".join(part.text for part in chunk.candidates[0].content.parts)
+
+
+def _stream_completion(prompt, analysis_kind):
     """
-    Sends commit details to the LLM for analysis and confidence scoring.
+    One model request, read incrementally until the output is complete enough to parse.
     """
-    # Format the imported prompt with the actual data
-    prompt = COMMIT_ANALYSIS_PROMPT.format(
-        commit_message=commit_message,
-        commit_diff=commit_diff,
-        review_comments=review_comments
+    limits = output_limits[analysis_kind]
+    started_at = time.monotonic()
+    # The resilience layer clamps attempts to the run deadline; keep the client-side timeout in step.
+    response = model.generate_content(
+        prompt + limits.prompt_suffix(),
+        stream=LLM_STREAMING,
+        generation_config={"max_output_tokens": limits.max_output_tokens},
+        request_options={"timeout": max(llm_caller.attempt_timeout(), 1.0)}
     )
-    
-    # Make the API call
+    return consume_stream(_chunk_texts(response), analysis_kind, limits, started_at)
+
+
+def _generate_content(prompt, analysis_kind):
+    """
+    Calls the model through the resilience layer and records stream timings.
+    Returns the response text ("" if the model produced none), or None if the
+    call failed after retries or the circuit is open.
+    """
     try:
-        response = model.generate_content(prompt)
-        # Ensure the response has text content
-        if response.candidates and response.candidates[0].content.parts:
-            return response.candidates[0].content.parts[0].text
-        else:
-            print("Warning: LLM response had no text content.")
-            return "Confidence Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
+        result = llm_caller.call(lambda: _stream_completion(prompt, analysis_kind))
     except Exception as e:
-        print(f"Error calling LLM for commit analysis: {e}")
-        return f"Confidence Score: 0\nJustification: LLM API call failed due to error: {e}\nActionable Improvements: Check API key, network, or rate limits."
+        print(f"Error calling LLM for {analysis_kind} analysis: {e}")
+        return None
+    stream_stats.record(analysis_kind, result)
+    return result.text
+
+
+def analyze_commit_with_llm(commit_message, commit_diff, review_comments=""):
+    """
+    Sends commit details to the LLM for analysis and confidence scoring.
+    Returns the raw LLM text, or None if the LLM call failed.
+    """
+    prompt = build_commit_prompt(commit_message, commit_diff, review_comments)
+
+    # Make the API call
+    response_text = _generate_content(prompt, "commit")
+    if response_text is None:
+        return None
+    # Ensure the response has text content
+    if response_text:
+        return response_text
+    else:
+        print("Warning: LLM response had no text content.")
+        return "Confidence Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
     
 
 
 def analyze_pr_with_llm(pr_title, pr_body, commits_data, reviews_data, comments_data):
     """
     Sends aggregated PR details to the LLM for overall PR analysis and release readiness scoring.
+    `commits_data`, `reviews_data` and `comments_data` are lists of utils.models records.
+    Returns the raw LLM text, or None if the LLM call failed.
     """
-    # Aggregate commit information
-    aggregated_commits_info = ""
-    for commit in commits_data:
-        aggregated_commits_info += f"Commit SHA: {commit['sha'][:7]}\n"
-        aggregated_commits_info += f"Message: {commit['message'].splitlines()[0]}\n" # First line of message
-        # Only include diff if it's not the placeholder "No diff available."
-        if commit['diff'] and commit['diff'] != 'No diff available.':
-            # For brevity, consider truncating long diffs for PR-level analysis if context window becomes an issue
-            aggregated_commits_info += f"Diff Snippet (first 200 chars):\n```\n{commit['diff'][:200]}\n```\n"
-        aggregated_commits_info += f"LLM Confidence Score: {commit['llm_analysis'].get('confidence_score', 'N/A')}\n"
-        aggregated_commits_info += "---\n"
-    if not aggregated_commits_info:
-        aggregated_commits_info = "No commits found or processed for this PR."
-
-    # Aggregate review comments
-    all_pr_review_comments = ""
-    for review in reviews_data:
-        all_pr_review_comments += f"Review by {review['user']} ({review['state']}): {review['body']}\n"
-    if not all_pr_review_comments:
-        all_pr_review_comments = "No review comments."
-
-    # Aggregate general PR comments
-    all_pr_general_comments = ""
-    for comment in comments_data:
-        all_pr_general_comments += f"Comment by {comment['user']}: {comment['body']}\n"
-    if not all_pr_general_comments:
-        all_pr_general_comments = "No general comments."
-
-    prompt = PR_ANALYSIS_PROMPT.format(
-        pr_title=pr_title,
-        pr_description=pr_body if pr_body else "No description provided.",
-        aggregated_commits_info=aggregated_commits_info,
-        all_pr_review_comments=all_pr_review_comments,
-        all_pr_general_comments=all_pr_general_comments
-    )
+    prompt = build_pr_prompt(pr_title, pr_body, commits_data, reviews_data, comments_data)
 
-    try:
-        response = model.generate_content(prompt)
-        if response.candidates and response.candidates[0].content.parts:
-            return response.candidates[0].content.parts[0].text
-        else:
-            print("Warning: LLM (PR) response had no text content.")
-            return "Release Readiness Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
-    except Exception as e:
-        print(f"Error calling LLM for PR analysis: {e}")
-        return f"Release Readiness Score: 0\nJustification: LLM API call failed due to error: {e}\nActionable Improvements: Check API key, network, or rate limits."
+    # Make the API call
+    response_text = _generate_content(prompt, "pr")
+    if response_text is None:
+        return None
+    if response_text:
+        return response_text
+    else:
+        print("Warning: LLM (PR) response had no text content.")
+        return "Release Readiness Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
 
 
 
-def analyze_milestone_with_llm(milestone_title, issues_data):
+def analyze_milestone_with_llm(milestone_title, issues_data, coverage=None, sampling=None):
     """
     Sends aggregated milestone data (issues, PRs, and their analyses) to the LLM
-    for overall milestone release confidence scoring.
+    for overall milestone release confidence scoring. `issues_data` maps issue
+    numbers to utils.models.IssueRecord objects.
+    `coverage` (from utils.scheduler.compute_coverage) tells the LLM how much of
+    the milestone was analyzed when a run stopped early. `sampling` (from
+    utils.sampling.summarize_sampling) is set when only a sample of commits was scored.
+    Returns the raw LLM text, or None if the LLM call failed.
     """
-    aggregated_milestone_data = f"Milestone: {milestone_title}\n\n"
-    
-    if not issues_data:
-        aggregated_milestone_data += "No issues or associated PRs found for this milestone."
-    else:
-        for issue_number, issue in issues_data.items():
-            aggregated_milestone_data += f"Issue #{issue['number']}: {issue['title']} (Status: {issue['state']})\n"
-            if issue['comments']:
-                aggregated_milestone_data += "  Issue Comments:\n"
-                for comment in issue['comments']:
-                    aggregated_milestone_data += f"    - {comment['user']}: {comment['body'][:100]}...\n" # Truncate for brevity
-            
-            prs = issue.get('associated_prs', {})
-            if prs:
-                aggregated_milestone_data += "  Associated Pull Requests:\n"
-                for pr_number, pr in prs.items():
-                    aggregated_milestone_data += f"    PR #{pr['number']}: {pr['title']} (Status: {pr['state']})\n"
-                    aggregated_milestone_data += f"      PR Description: {pr['description'][:100]}...\n" # Truncate
-                    
-                    if pr.get('llm_pr_analysis'):
-                        pr_score = pr['llm_pr_analysis'].get('release_readiness_score', 'N/A')
-                        pr_justification = pr['llm_pr_analysis'].get('justification', '')
-                        aggregated_milestone_data += f"      Overall PR Readiness Score: {pr_score}\n"
-                        aggregated_milestone_data += f"      PR Justification: {pr_justification[:150]}...\n" # Truncate
-                        if pr['llm_pr_analysis'].get('actionable_improvements'):
-                             aggregated_milestone_data += f"      PR Improvements: {'; '.join(pr['llm_pr_analysis']['actionable_improvements'][:2])}...\n"
-                    
-                    if pr.get('commits'):
-                        aggregated_milestone_data += "      Commits:\n"
-                        for commit in pr['commits']:
-                            commit_score = commit['llm_analysis'].get('confidence_score', 'N/A')
-                            aggregated_milestone_data += f"        Commit {commit['sha'][:7]}: {commit['message'].splitlines()[0]} (Score: {commit_score})\n"
-                    
-                    if pr.get('reviews'):
-                        aggregated_milestone_data += "      Reviews:\n"
-                        for review in pr['reviews']:
-                            aggregated_milestone_data += f"        - {review['user']} ({review['state']}): {review['body'][:100]}...\n"
-                    
-                    aggregated_milestone_data += "\n" # Blank line for PR separation
-            else:
-                aggregated_milestone_data += "  No PRs linked.\n\n"
-
-    prompt = MILESTONE_ANALYSIS_PROMPT.format(
-        milestone_title=milestone_title,
-        aggregated_milestone_data=aggregated_milestone_data
-    )
+    prompt = build_milestone_prompt(milestone_title, issues_data, coverage, sampling)
 
-    try:
-        response = model.generate_content(prompt)
-        if response.candidates and response.candidates[0].content.parts:
-            return response.candidates[0].content.parts[0].text
-        else:
-            print("Warning: LLM (Milestone) response had no text content.")
-            return "Release Confidence Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
-    except Exception as e:
-        print(f"Error calling LLM for milestone analysis: {e}")
-        return f"Release Confidence Score: 0\nJustification: LLM API call failed due to error: {e}\nActionable Improvements: Check API key, network, or rate limits."
+    # Make the API call
+    response_text = _generate_content(prompt, "milestone")
+    if response_text is None:
+        return None
+    if response_text:
+        return response_text
+    else:
+        print("Warning: LLM (Milestone) response had no text content.")
+        return "Release Confidence Score: 50\nJustification: LLM could not generate a proper response.\nActionable Improvements: Re-evaluate input or prompt."
@@ -0,0 +1,153 @@
+from llm_agent.prompts import COMMIT_ANALYSIS_PROMPT
+from llm_agent.prompts import PR_ANALYSIS_PROMPT
+from llm_agent.prompts import MILESTONE_ANALYSIS_PROMPT
+
+
+def build_commit_prompt(commit_message, commit_diff, review_comments=""):
+    """
+    Builds the commit analysis prompt.
+    """
+    # Format the imported prompt with the actual data
+    return COMMIT_ANALYSIS_PROMPT.format(
+        commit_message=commit_message,
+        commit_diff=commit_diff,
+        review_comments=review_comments
+    )
+
+
+def build_pr_prompt(pr_title, pr_body, commits_data, reviews_data, comments_data):
+    """
+    Builds the PR analysis prompt from the PR's commits, reviews and comments.
+    `commits_data`, `reviews_data` and `comments_data` are lists of utils.models records.
+    """
+    # Aggregate commit information
+    aggregated_commits_info = ""
+    for commit in commits_data:
+        aggregated_commits_info += f"Commit SHA: {commit.sha[:7]}\n"
+        aggregated_commits_info += f"Message: {commit.subject}\n" # First line of message
+        # Only the first 200 chars of the diff are loaded from the diff store
+        diff_snippet = commit.diff_snippet(200)
+        # Only include diff if it's not the placeholder "No diff available."
+        if diff_snippet and diff_snippet != 'No diff available.':
+            aggregated_commits_info += f"Diff Snippet (first 200 chars):\n```\n{diff_snippet}\n```\n"
+        aggregated_commits_info += f"LLM Confidence Score: {commit.llm_analysis.get('confidence_score', 'N/A')}\n"
+        aggregated_commits_info += "---\n"
+    if not aggregated_commits_info:
+        aggregated_commits_info = "No commits found or processed for this PR."
+
+    # Aggregate review comments
+    all_pr_review_comments = ""
+    for review in reviews_data:
+        all_pr_review_comments += f"Review by {review.user} ({review.state}): {review.body}\n"
+    if not all_pr_review_comments:
+        all_pr_review_comments = "No review comments."
+
+    # Aggregate general PR comments
+    all_pr_general_comments = ""
+    for comment in comments_data:
+        all_pr_general_comments += f"Comment by {comment.user}: {comment.body}\n"
+    if not all_pr_general_comments:
+        all_pr_general_comments = "No general comments."
+
+    return PR_ANALYSIS_PROMPT.format(
+        pr_title=pr_title,
+        pr_description=pr_body if pr_body else "No description provided.",
+        aggregated_commits_info=aggregated_commits_info,
+        all_pr_review_comments=all_pr_review_comments,
+        all_pr_general_comments=all_pr_general_comments
+    )
+
+
+def build_milestone_prompt(milestone_title, issues_data, coverage=None, sampling=None):
+    """
+    Builds the milestone analysis prompt from all issues, PRs and their analyses.
+    `issues_data` maps issue numbers to utils.models.IssueRecord objects.
+    `coverage` (from utils.scheduler.compute_coverage) tells the LLM how much of
+    the milestone was analyzed when a run stopped early. `sampling` (from
+    utils.sampling.summarize_sampling) describes the commit sample, if any.
+    """
+    aggregated_milestone_data = f"Milestone: {milestone_title}\n"
+    if coverage and coverage.get("partial"):
+        aggregated_milestone_data += (
+            f"Analysis Coverage: PARTIAL - {coverage['commits_analyzed']}/{coverage['commits_total']} commits and "
+            f"{coverage['prs_analyzed']}/{coverage['prs_total']} PRs analyzed (highest-risk first). "
+            "Base the score only on the analyzed items and account for the unanalyzed remainder as uncertainty.\n"
+        )
+    if sampling and sampling.get("estimated_commit_score"):
+        estimate = sampling["estimated_commit_score"]
+        aggregated_milestone_data += (
+            f"Commit Sampling: {sampling['commits_sampled']}/{sampling['commits_total']} commits scored "
+            f"(stratified sample at rate {sampling['sample_rate']}, all high-risk commits included). "
+            f"Estimated mean commit score: {estimate['mean']} (95% CI {estimate['ci_low']}-{estimate['ci_high']}). "
+            "Commits marked NOT SAMPLED are represented by these estimates.\n"
+        )
+    aggregated_milestone_data += "\n"
+    
+    if not issues_data:
+        aggregated_milestone_data += "No issues or associated PRs found for this milestone."
+    else:
+        listed_prs = set()
+        for issue_number, issue in issues_data.items():
+            aggregated_milestone_data += f"Issue #{issue.number}: {issue.title} (Status: {issue.state})\n"
+            if issue.comments:
+                aggregated_milestone_data += "  Issue Comments:\n"
+                for comment in issue.comments:
+                    aggregated_milestone_data += f"    - {comment.user}: {comment.body[:100]}...\n" # Truncate for brevity
+            
+            prs = issue.associated_prs
+            if prs:
+                aggregated_milestone_data += "  Associated Pull Requests:\n"
+                for pr_number, pr in prs.items():
+                    if pr.number in listed_prs:
+                        # Shared PRs are analyzed once; don't repeat their details for every linking issue.
+                        aggregated_milestone_data += f"    PR #{pr.number}: {pr.title} (Status: {pr.state}) - also linked above, see details there\n\n"
+                        continue
+                    listed_prs.add(pr.number)
+                    aggregated_milestone_data += f"    PR #{pr.number}: {pr.title} (Status: {pr.state})\n"
+                    aggregated_milestone_data += f"      PR Description: {pr.description[:100]}...\n" # Truncate
+                    
+                    if pr.analysis_status == 'not_analyzed':
+                        aggregated_milestone_data += "      Overall PR Readiness Score: NOT ANALYZED (time budget exhausted)\n"
+                    elif pr.analysis_status == 'llm_failed':
+                        aggregated_milestone_data += "      Overall PR Readiness Score: NOT ANALYZED (LLM call failed)\n"
+                    elif pr.analysis_status == 'error':
+                        aggregated_milestone_data += "      Overall PR Readiness Score: NOT ANALYZED (error during analysis)\n"
+                    elif pr.llm_pr_analysis:
+                        pr_score = pr.llm_pr_analysis.get('release_readiness_score', 'N/A')
+                        pr_justification = pr.llm_pr_analysis.get('justification', '')
+                        aggregated_milestone_data += f"      Overall PR Readiness Score: {pr_score}\n"
+                        aggregated_milestone_data += f"      PR Justification: {pr_justification[:150]}...\n" # Truncate
+                        if pr.llm_pr_analysis.get('actionable_improvements'):
+                             aggregated_milestone_data += f"      PR Improvements: {'; '.join(pr.llm_pr_analysis['actionable_improvements'][:2])}...\n"
+
+                    if pr.commit_score_estimate and pr.commit_score_estimate['commits_scored'] < pr.commit_score_estimate['commits_total']:
+                        estimate = pr.commit_score_estimate
+                        aggregated_milestone_data += (
+                            f"      Estimated Commit Score ({estimate['commits_scored']}/{estimate['commits_total']} sampled): "
+                            f"{estimate['mean']} (95% CI {estimate['ci_low']}-{estimate['ci_high']})\n"
+                        )
+                    
+                    if pr.commits:
+                        aggregated_milestone_data += "      Commits:\n"
+                        for commit in pr.commits:
+                            if commit.llm_analysis:
+                                commit_score = commit.llm_analysis.get('confidence_score', 'N/A')
+                            elif commit.analysis_status == 'not_sampled':
+                                commit_score = 'NOT SAMPLED'
+                            else:
+                                commit_score = 'NOT ANALYZED'
+                            aggregated_milestone_data += f"        Commit {commit.sha[:7]}: {commit.subject} (Score: {commit_score})\n"
+                    
+                    if pr.reviews:
+                        aggregated_milestone_data += "      Reviews:\n"
+                        for review in pr.reviews:
+                            aggregated_milestone_data += f"        - {review.user} ({review.state}): {review.body[:100]}...\n"
+                    
+                    aggregated_milestone_data += "\n" # Blank line for PR separation
+            else:
+                aggregated_milestone_data += "  No PRs linked.\n\n"
+
+    return MILESTONE_ANALYSIS_PROMPT.format(
+        milestone_title=milestone_title,
+        aggregated_milestone_data=aggregated_milestone_data
+    )
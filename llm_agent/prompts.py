@@ -129,4 +129,9 @@ Actionable Improvements:
 - [Recommendation 1]
 - [Recommendation 2]
 - ... (Each recommendation on a new line prefixed with '- ')
-"""
\ No newline at end of file
+"""
+
+# Appended to every prompt to bound output size (see llm_agent/streaming.py).
+OUTPUT_LENGTH_INSTRUCTION = """
+**Length Limits:** Output the score line first. Keep the justification under {justification_words} words and list at most {max_improvements} actionable improvements, one line each. Do not add any text after the improvements.
+"""
@@ -0,0 +1,226 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# HTTP status codes worth retrying: rate limiting and transient server-side failures.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is rejecting calls because the backend looks down."""
+
+
+class LLMCallTimeout(TimeoutError):
+    """Raised when an LLM call (including its hedge) exceeds the per-call deadline."""
+
+
+def is_retryable(exc):
+    """
+    Classifies an exception from the LLM client as transient (retry) or permanent (give up).
+    google.api_core exceptions carry the HTTP status in `.code`.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive transient failures and rejects
+    calls for `cooldown` seconds. After the cooldown one trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Warning: LLM circuit breaker opened after {self._consecutive_failures} consecutive failures.")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """
+    Wraps LLM calls with a per-call deadline, classified retries with
+    exponential backoff and full jitter, p95-based request hedging and a
+    circuit breaker. Counters are available in `stats`.
+
+    `deadline` is an optional absolute time.monotonic() value for the whole
+    run. While it is set, every attempt's timeout is clamped to the time left,
+    retries whose backoff would overrun it are skipped, and no new call is
+    started once it has passed.
+    """
+
+    def __init__(self, call_timeout=60.0, max_retries=3, backoff_base=1.0, backoff_max=30.0,
+                 hedging=True, hedge_min_samples=10, circuit_breaker=None):
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedging = hedging
+        self.hedge_min_samples = hedge_min_samples
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.deadline = None
+        self._latencies = deque(maxlen=200)
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm_call")
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "circuit_rejections": 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """
+        Builds a caller from LLM_* environment variables (see .env.example).
+        """
+        return cls(
+            call_timeout=float(os.getenv("LLM_CALL_TIMEOUT", "60")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+            backoff_base=float(os.getenv("LLM_BACKOFF_BASE", "1")),
+            backoff_max=float(os.getenv("LLM_BACKOFF_MAX", "30")),
+            hedging=os.getenv("LLM_HEDGING", "true").lower() in ("1", "true", "yes"),
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                cooldown=float(os.getenv("LLM_CIRCUIT_COOLDOWN", "60"))
+            )
+        )
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def attempt_timeout(self):
+        """
+        Returns the timeout for an attempt started now: `call_timeout`, clamped
+        to the time left before `deadline`. Zero or less means no time is left.
+        """
+        if self.deadline is None:
+            return self.call_timeout
+        return min(self.call_timeout, self.deadline - time.monotonic())
+
+    def hedge_delay(self):
+        """
+        Returns the p95 latency of recent successful calls, or None until enough samples exist.
+        """
+        with self._lock:
+            if not self.hedging or len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def _attempt(self, fn, timeout):
+        """
+        Runs one attempt, sending a hedged duplicate if the primary is slower than p95.
+        Returns the first successful result; raises the last error or LLMCallTimeout.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        started_at = {self._executor.submit(fn): start}
+        primary = next(iter(started_at))
+
+        delay = self.hedge_delay()
+        if delay is not None and delay < timeout:
+            done, _ = wait(started_at, timeout=delay)
+            if not done:
+                self._count("hedges")
+                started_at[self._executor.submit(fn)] = time.monotonic()
+
+        pending = set(started_at)
+        last_error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    with self._lock:
+                        self._latencies.append(time.monotonic() - started_at[future])
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    return future.result()
+                last_error = error
+
+        if last_error is not None and not pending:
+            raise last_error
+        # Stuck requests keep running in the background; we just stop waiting for them.
+        self._count("timeouts")
+        raise LLMCallTimeout(f"LLM call exceeded {timeout:g}s deadline")
+
+    def call(self, fn):
+        """
+        Calls `fn()` with retries. Raises CircuitOpenError while the backend is
+        considered down, LLMCallTimeout once the run deadline has passed, or the
+        last error once retries are exhausted.
+        """
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            timeout = self.attempt_timeout()
+            if timeout <= 0:
+                self._count("timeouts")
+                self._count("failures")
+                raise LLMCallTimeout("Run deadline reached; skipping LLM call.")
+            if not self.circuit_breaker.allow():
+                self._count("circuit_rejections")
+                raise CircuitOpenError("LLM circuit breaker is open; skipping call.")
+
+            self._count("attempts")
+            try:
+                result = self._attempt(fn, timeout)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The backend did answer (e.g. 400, 403, safety block), so it is up: this also
+                    # settles a half-open trial instead of leaving the breaker stuck half-open.
+                    self.circuit_breaker.record_success()
+                    self._count("failures")
+                    raise
+                self.circuit_breaker.record_failure()
+                if attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                if backoff >= self.attempt_timeout():
+                    # No time would be left for the retry itself.
+                    self._count("failures")
+                    raise
+                print(f"Warning: transient LLM error ({e}); retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s.")
+                self._count("retries")
+                time.sleep(backoff)
+                continue
+
+            self.circuit_breaker.record_success()
+            return result
@@ -0,0 +1,173 @@
+"""
+Streaming consumption of LLM responses with early cutoff.
+
+The parsers in utils.data_parser only need the score, a justification and a
+few improvement bullets. Responses are therefore streamed and read
+incrementally. The score is picked up as soon as it arrives, and the stream
+is abandoned once the configured number of improvement bullets has been
+received. Per prompt type, output is also bounded by `max_output_tokens`, and
+a verbosity level caps the justification length requested in the prompt.
+Time to first token and time to score are recorded in StreamStats.
+
+This module has no google.generativeai dependency, so it can be exercised
+with any iterable of text chunks.
+"""
+import os
+import re
+import threading
+import time
+
+from llm_agent.prompts import OUTPUT_LENGTH_INSTRUCTION
+
+# Default max_output_tokens per prompt type; override with LLM_MAX_OUTPUT_TOKENS_<KIND>.
+DEFAULT_MAX_OUTPUT_TOKENS = {"commit": 512, "pr": 768, "milestone": 1536}
+
+# Verbosity level -> (max justification words, max improvement bullets).
+VERBOSITY_LEVELS = {
+    "brief": (60, 3),
+    "normal": (120, 5),
+    "detailed": (300, 8)
+}
+DEFAULT_VERBOSITY = "normal"
+
+# A score is complete once a non-digit follows it (chunks can split "8" and "5").
+SCORE_PATTERNS = {
+    "commit": re.compile(r"Confidence Score: (\d+)\D"),
+    "pr": re.compile(r"Release Readiness Score: (\d+)\D"),
+    "milestone": re.compile(r"Release Confidence Score: (\d+)\D")
+}
+IMPROVEMENTS_HEADER = "Actionable Improvements:"
+COMPLETE_BULLET_PATTERN = re.compile(r"^\s*- .+\n", re.MULTILINE)
+
+
+class OutputLimits:
+    """
+    Output-size settings for one prompt type.
+    """
+
+    def __init__(self, max_output_tokens, justification_words, max_improvements):
+        self.max_output_tokens = max_output_tokens
+        self.justification_words = justification_words
+        self.max_improvements = max_improvements
+
+    @classmethod
+    def from_env(cls, kind):
+        """
+        Reads LLM_MAX_OUTPUT_TOKENS_<KIND> and LLM_VERBOSITY (brief, normal or detailed).
+        """
+        verbosity = os.getenv("LLM_VERBOSITY", DEFAULT_VERBOSITY).lower()
+        if verbosity not in VERBOSITY_LEVELS:
+            raise ValueError(f"LLM_VERBOSITY must be one of {', '.join(VERBOSITY_LEVELS)}, got '{verbosity}'.")
+        justification_words, max_improvements = VERBOSITY_LEVELS[verbosity]
+        max_output_tokens = int(os.getenv(f"LLM_MAX_OUTPUT_TOKENS_{kind.upper()}", DEFAULT_MAX_OUTPUT_TOKENS[kind]))
+        return cls(max_output_tokens, justification_words, max_improvements)
+
+    def prompt_suffix(self):
+        return OUTPUT_LENGTH_INSTRUCTION.format(
+            justification_words=self.justification_words,
+            max_improvements=self.max_improvements
+        )
+
+
+class StreamResult:
+    __slots__ = ("text", "time_to_first_token", "time_to_score", "total_time", "cut_off")
+
+    def __init__(self, text, time_to_first_token, time_to_score, total_time, cut_off):
+        self.text = text
+        self.time_to_first_token = time_to_first_token
+        self.time_to_score = time_to_score
+        self.total_time = total_time
+        self.cut_off = cut_off
+
+
+def _improvements_end(text, max_improvements):
+    """
+    Returns the offset just past the `max_improvements`-th complete bullet, or None if not there yet.
+    """
+    header = text.find(IMPROVEMENTS_HEADER)
+    if header == -1:
+        return None
+    for count, bullet in enumerate(COMPLETE_BULLET_PATTERN.finditer(text, header + len(IMPROVEMENTS_HEADER)), 1):
+        if count == max_improvements:
+            return bullet.end()
+    return None
+
+
+def consume_stream(chunks, kind, limits, started_at=None):
+    """
+    Reads text chunks until the stream ends or `limits.max_improvements`
+    complete improvement bullets have arrived. Returns a StreamResult; times
+    are seconds since `started_at` (defaults to now).
+    """
+    started_at = time.monotonic() if started_at is None else started_at
+    score_pattern = SCORE_PATTERNS[kind]
+    parts = []
+    text = ""
+    time_to_first_token = time_to_score = None
+    cut_off = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if time_to_first_token is None:
+            time_to_first_token = time.monotonic() - started_at
+        parts.append(chunk)
+        text = "".join(parts)
+        if time_to_score is None:
+            if not score_pattern.search(text):
+                continue
+            time_to_score = time.monotonic() - started_at
+        if "\n" in chunk:
+            end = _improvements_end(text, limits.max_improvements)
+            if end is not None:
+                text = text[:end]
+                cut_off = True
+                break
+
+    return StreamResult(text, time_to_first_token, time_to_score, time.monotonic() - started_at, cut_off)
+
+
+class StreamStats:
+    """
+    Thread-safe latency samples per prompt type. `summary()` gives averages and p95s.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, kind, result):
+        with self._lock:
+            samples = self._samples.setdefault(kind, {
+                "time_to_first_token": [], "time_to_score": [], "total_time": [], "cut_off": 0, "output_chars": 0
+            })
+            for key in ("time_to_first_token", "time_to_score", "total_time"):
+                value = getattr(result, key)
+                if value is not None:
+                    samples[key].append(value)
+            samples["cut_off"] += result.cut_off
+            samples["output_chars"] += len(result.text)
+
+    @staticmethod
+    def _describe(values):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return {
+            "avg": round(sum(ordered) / len(ordered), 3),
+            "p95": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 3)
+        }
+
+    def summary(self):
+        with self._lock:
+            return {
+                kind: {
+                    "calls": len(samples["total_time"]),
+                    "early_cutoffs": samples["cut_off"],
+                    "avg_output_chars": round(samples["output_chars"] / len(samples["total_time"])) if samples["total_time"] else 0,
+                    "time_to_first_token": self._describe(samples["time_to_first_token"]),
+                    "time_to_score": self._describe(samples["time_to_score"]),
+                    "total_time": self._describe(samples["total_time"])
+                }
+                for kind, samples in self._samples.items()
+            }
@@ -1,187 +1,384 @@
 from github_client.client import GitHubClient
-from llm_agent.analysis import analyze_commit_with_llm, analyze_pr_with_llm, analyze_milestone_with_llm
+from llm_agent.prompt_builders import build_commit_prompt
+from llm_agent.analysis import analyze_commit_with_llm, analyze_pr_with_llm, analyze_milestone_with_llm, llm_caller, stream_stats
 from utils.data_parser import parse_llm_commit_analysis, parse_llm_pr_analysis, parse_llm_milestone_analysis, save_analysis_to_json
 from utils.report_generator import generate_console_report # Will use this after milestone analysis is done
+from utils.scheduler import build_analysis_queue, run_analysis_queue, mark_analysis_status, compute_coverage, STATUS_LLM_FAILED
+from utils.models import IssueRecord, PullRequestRecord, CommitRecord, ReviewRecord, ReviewCommentRecord, CommentRecord
+from utils.diff_store import DiffStore
+from utils.sampling import select_high_risk, select_sample, summarize_sampling
+from utils.planner import collect_plan_metadata, estimate_plan, format_plan
+from utils.journal import RunJournal
+from utils.history_export import export_run, HISTORY_EXPORT_AVAILABLE
+from utils.work_graph import WorkGraph
+from utils.precheck import CommitPrecheck
+from functools import partial
+import argparse
 import os
-import re
+import time
 from datetime import datetime
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze the release readiness of a GitHub milestone.")
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Wall-clock budget in seconds for the run, counted from startup. Highest-risk items are analyzed first; "
+             "items left when the budget runs out are marked as not analyzed in the report."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the last run for this milestone from its journal in reports/, "
+             "skipping issue fetches and commit/PR analyses that already completed."
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only estimate the cost of a run (GitHub requests, LLM calls, prompt tokens, wall time) "
+             "from a metadata-only pass. No LLM calls are made."
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=None,
+        help="Sampling mode for large milestones: analyze this fraction (0-1] of each PR's commits, "
+             "stratified by diff size and file area, plus every high-risk commit. "
+             "PR and milestone commit scores are extrapolated with 95%% confidence intervals."
+    )
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        default=0,
+        help="Random seed for --sample-rate, for reproducible samples."
+    )
+    args = parser.parse_args()
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be a positive number of seconds.")
+    if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+        parser.error("--sample-rate must be in (0, 1].")
+    return args
+
+
+def collect_issue_data(github_client, issue, diff_store, work_graph):
+    """
+    Fetches comments, linked PRs, commits, reviews and PR comments for an issue.
+    No LLM calls are made here; analysis happens later in risk order.
+    Only compact records are kept; the PyGithub objects are dropped on return
+    and diffs are spilled to `diff_store`. PRs and commits already in
+    `work_graph` (linked from an earlier issue or shared by stacked PRs) are
+    reused instead of being fetched again.
+    """
+    issue_data = IssueRecord.from_github(issue)
+
+    issue_comments = github_client.get_issue_comments(issue.number)
+    for comment in issue_comments:
+        print(f"    Issue Comment by {comment.user.login}: {comment.body[:50]}...")
+        issue_data.comments.append(CommentRecord.from_github(comment))
+
+    issue_associated_prs = github_client.get_linked_pull_requests(issue.number, issue_comments)
+    if not issue_associated_prs:
+        print(f"  No explicit Pull Requests found linked to Issue #{issue.number} via search or comments.")
+
+    for pr in issue_associated_prs:
+        known_pr = work_graph.get_pr(pr.number)
+        if known_pr is not None:
+            print(f"  --- PR #{pr.number} already fetched for another issue, reusing it ---")
+            issue_data.associated_prs[pr.number] = known_pr
+            continue
+
+        pr_data = PullRequestRecord.from_github(pr)
+
+        print(f"  --- Fetching Associated PR: #{pr.number}: {pr.title} ---")
+        print(f"    PR URL: {pr.html_url}")
+
+        # `get_commits_for_pull_request` returns a list of dictionaries
+        for commit_dict in github_client.get_commits_for_pull_request(pr, skip_shas=work_graph.commits):
+            commit_info = work_graph.get_commit(commit_dict["sha"])
+            if commit_info is None:
+                commit_info = CommitRecord.from_client_dict(commit_dict, diff_store)
+            print(f"      Commit: {commit_info.sha[:7]} - {commit_info.subject}")
+            pr_data.commits.append(commit_info)
+
+        reviews_added = set()
+        for review in github_client.get_reviews_for_pull_request(pr):
+            if review.state == "CHANGES_REQUESTED":
+                pr_data.changes_requested = True
+            if review.body:
+                review_tuple = (review.user.login, review.state, review.body)
+                if review_tuple not in reviews_added:
+                    pr_data.reviews.append(ReviewRecord.from_github(review))
+                    reviews_added.add(review_tuple)
+
+        # Inline comments carry the commit, file and line they refer to, so each commit prompt gets only its own.
+        for comment in github_client.get_review_comments_for_pull_request(pr):
+            pr_data.review_comments.append(ReviewCommentRecord.from_github(comment))
+
+        for comment in github_client.get_comments_for_pull_request(pr):
+            print(f"      PR Comment by {comment.user.login}: {comment.body[:50]}...")
+            pr_data.comments.append(CommentRecord.from_github(comment))
+
+        issue_data.associated_prs[pr.number] = work_graph.add_pr(pr_data)
+
+    return issue_data
+
+
+def unit_journal_key(unit):
+    """
+    Journal (kind, key) for a scheduled analysis unit.
+    """
+    if unit["kind"] == "commit":
+        return "commit_analysis", unit["commit"].sha
+    return "pr_analysis", unit["pr"].number
+
+
+def apply_journaled_results(queue, journal):
+    """
+    Restores analyses completed in a previous run and returns the units still to do.
+    """
+    remaining = []
+    for unit in queue:
+        result = journal.get(*unit_journal_key(unit))
+        if result is None:
+            remaining.append(unit)
+        elif unit["kind"] == "commit":
+            unit["commit"].llm_analysis = result
+        else:
+            unit["pr"].llm_pr_analysis = result
+    return remaining
+
+
+def analyze_commit_unit(unit, journal, prompt_sizes):
+    """
+    Runs the LLM commit analysis for a scheduled commit unit and journals the result.
+    Only the inline review comments on this commit's changes go into its prompt;
+    PR-wide review summaries are left to the PR analysis. `prompt_sizes`
+    accumulates the prompt size against what it would be with every PR review attached.
+    """
+    pr_data, commit_info = unit["pr"], unit["commit"]
+    commit_review_comments = [
+        f"Review comment by {comment.user} on {comment.path}" + (f" line {comment.line}" if comment.line else "") + f": {comment.body}"
+        for comment in pr_data.review_comments_for(commit_info)
+    ]
+    relevant_review_text = "\n".join(commit_review_comments) if commit_review_comments else "No specific review comments provided for this commit."
+
+    # The diff is loaded from the spill store only for the duration of this call
+    commit_diff = commit_info.diff
+    prompt_chars = len(build_commit_prompt(commit_info.message, commit_diff, relevant_review_text))
+    all_reviews_text = "\n".join(f"Review by {review.user} ({review.state}): {review.body}" for review in pr_data.reviews)
+    prompt_sizes["commits"] += 1
+    prompt_sizes["chars_after"] += prompt_chars
+    prompt_sizes["chars_before"] += prompt_chars - len(relevant_review_text) + len(all_reviews_text or relevant_review_text)
+
+    print(f"      Calling LLM for commit {commit_info.sha[:7]} analysis (risk {unit['risk']})...")
+    llm_output_raw_commit = analyze_commit_with_llm(
+        commit_info.message,
+        commit_diff,
+        relevant_review_text
+    )
+    if llm_output_raw_commit is None:
+        commit_info.analysis_status = STATUS_LLM_FAILED
+        journal.record_failure(*unit_journal_key(unit), "LLM call failed")
+        return
+    commit_info.llm_analysis = parse_llm_commit_analysis(llm_output_raw_commit)
+    journal.record(*unit_journal_key(unit), commit_info.llm_analysis)
+
+
+def analyze_pr_unit(unit, journal):
+    """
+    Runs the LLM PR analysis for a scheduled PR unit, using only the commits analyzed so far,
+    and journals the result.
+    """
+    pr_data = unit["pr"]
+    print(f"  Calling LLM for PR #{pr_data.number} overall analysis (risk {unit['risk']})...")
+    llm_output_raw_pr = analyze_pr_with_llm(
+        pr_data.title,
+        pr_data.description,
+        [commit for commit in pr_data.commits if commit.llm_analysis],
+        pr_data.reviews,
+        pr_data.comments
+    )
+    if llm_output_raw_pr is None:
+        pr_data.analysis_status = STATUS_LLM_FAILED
+        journal.record_failure(*unit_journal_key(unit), "LLM call failed")
+        return
+    pr_data.llm_pr_analysis = parse_llm_pr_analysis(llm_output_raw_pr)
+    journal.record(*unit_journal_key(unit), pr_data.llm_pr_analysis)
+
+
 def main():
+    args = parse_args()
+    # The --deadline budget covers the whole run, including the GitHub fetch.
+    run_deadline = time.monotonic() + args.deadline if args.deadline is not None else None
     print("Starting GitHub Release Agent...")
     try:
+        # Trivial commits (docs, lockfiles, version bumps, whitespace, renames) get a heuristic analysis instead of an LLM call.
+        # Built first so a bad PRECHECK_RULES_FILE fails before any GitHub requests are made.
+        precheck = CommitPrecheck.from_env()
         github_client = GitHubClient()
-        
-        milestone_to_test = os.getenv("TEST_MILESTONE_TITLE", "Sprint-1") 
+
+        milestone_to_test = os.getenv("TEST_MILESTONE_TITLE", "Sprint-1")
         # Check if the milestone exists. If not, don't proceed with fetching issues
         milestone = None
         for m in github_client.repo.get_milestones(state='open'):
             if m.title == milestone_to_test:
                 milestone = m
                 break
-        
+
         if not milestone:
             print(f"Milestone '{milestone_to_test}' not found or is closed. Exiting.")
             return # Exit if milestone not found
 
         issues = github_client.get_issues_for_milestone(milestone_to_test)
-        
+
+        if args.plan:
+            print("\nPlanning run (metadata only):")
+            # Analysis units run one at a time, so the plan assumes a concurrency of 1.
+            plan = estimate_plan(milestone_to_test, collect_plan_metadata(github_client, issues), args.sample_rate,
+                                 concurrency=1, precheck_enabled=precheck.rules.enabled)
+            print("\n" + format_plan(plan))
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            save_analysis_to_json(plan, f"milestone_{milestone_to_test.replace(' ', '_')}_plan_{timestamp}.json")
+            return
+
         milestone_analysis_results = {
             "milestone_title": milestone_to_test,
+            "repo": github_client.repo.full_name,
             "issues": {},
-            "llm_milestone_analysis": {}
+            "llm_milestone_analysis": {},
+            "coverage": {},
+            "llm_call_stats": {},
+            "llm_stream_stats": {},
+            "work_graph": {},
+            "precheck": {},
+            "failed_issues": []
         }
 
         if issues:
-            print("\nProcessing fetched issues:")
+            diff_store = DiffStore()
+            # Every completed unit of work is journaled so a crashed run can be resumed with --resume.
+            journal = RunJournal(
+                os.path.join("reports", f"journal_{milestone_to_test.replace(' ', '_')}.jsonl"),
+                resume=args.resume
+            )
+            # One node per unique PR and commit, shared by every issue/PR that links to it.
+            work_graph = WorkGraph()
+            print("\nFetching data for issues:")
             for issue in issues:
-                print(f"\n--- Processing Issue #{issue.number}: {issue.title} ---")
-                
-                issue_data = {
-                    "number": issue.number,
-                    "title": issue.title,
-                    "url": issue.html_url,
-                    "state": issue.state,
-                    "comments": [],
-                    "associated_prs": {}
-                }
-                
-                issue_comments = github_client.get_issue_comments(issue.number)
-                for comment in issue_comments:
-                    print(f"    Issue Comment by {comment.user.login}: {comment.body[:50]}...")
-                    issue_data["comments"].append({
-                        "user": comment.user.login,
-                        "body": comment.body
-                    })
-
-                issue_associated_prs = []
-                processed_pr_numbers = set()
-
-                for comment in issue_comments:
-                    pr_url_match = re.search(r'https://github\.com/[^/]+/[^/]+/pull/(\d+)', comment.body)
-                    if pr_url_match:
-                        pr_number_from_comment = int(pr_url_match.group(1))
-                        if pr_number_from_comment not in processed_pr_numbers:
-                            pr_from_comment = github_client.get_pull_request_details(pr_number_from_comment)
-                            if pr_from_comment:
-                                issue_associated_prs.append(pr_from_comment)
-                                processed_pr_numbers.add(pr_number_from_comment)
-
-                search_found_prs = github_client.get_pull_requests_referencing_issue(issue.number)
-                for pr in search_found_prs:
-                    if pr.number not in processed_pr_numbers:
-                        issue_associated_prs.append(pr)
-                        processed_pr_numbers.add(pr.number)
-
-                if issue_associated_prs:
-                    for pr in issue_associated_prs:
-                        pr_data = {
-                            "number": pr.number,
-                            "title": pr.title,
-                            "url": pr.html_url,
-                            "state": pr.state,
-                            "user": pr.user.login,
-                            "description": pr.body,
-                            "commits": [],
-                            "reviews": [],
-                            "comments": [],
-                            "llm_pr_analysis": {}
-                        }
-                        
-                        print(f"  --- Processing Associated PR: #{pr.number}: {pr.title} ---")
-                        print(f"    PR URL: {pr.html_url}")
-
-                        # `get_commits_for_pull_request` now returns a list of dictionaries
-                        commits = github_client.get_commits_for_pull_request(pr) 
-                        current_pr_reviews_added = set() 
-                        
-                        # Loop through the dictionaries directly
-                        for commit_dict in commits: # Renamed variable to avoid confusion
-                            # Access commit data using dictionary keys
-                            commit_info = {
-                                "sha": commit_dict["sha"],
-                                "message": commit_dict["message"],
-                                "author": commit_dict["author"],
-                                "date": commit_dict["date"],
-                                "diff": commit_dict["diff"], # This now correctly holds the diff
-                                "llm_analysis": {}
-                            }
-                            
-                            print(f"      Commit: {commit_info['sha'][:7]} - {commit_info['message'].splitlines()[0]}")
-                            
-                            pr_reviews = github_client.get_reviews_for_pull_request(pr)
-                            commit_review_comments = []
-                            for review in pr_reviews:
-                                if review.body:
-                                    commit_review_comments.append(f"Review by {review.user.login} ({review.state}): {review.body}")
-                                    review_tuple = (review.user.login, review.state, review.body)
-                                    if review_tuple not in current_pr_reviews_added:
-                                        pr_data["reviews"].append({
-                                            "user": review.user.login,
-                                            "state": review.state,
-                                            "body": review.body
-                                        })
-                                        current_pr_reviews_added.add(review_tuple)
-
-                            relevant_review_text = "\n".join(commit_review_comments) if commit_review_comments else "No specific review comments provided for this commit."
-
-                            print(f"      Calling LLM for commit {commit_info['sha'][:7]} analysis...")
-                            llm_output_raw_commit = analyze_commit_with_llm(
-                                commit_info["message"],
-                                commit_info["diff"],
-                                relevant_review_text
-                            )
-                            parsed_llm_data_commit = parse_llm_commit_analysis(llm_output_raw_commit)
-                            # Standardize key here:
-                            if "actionable_improvements" in parsed_llm_data_commit:
-                                parsed_llm_data_commit["actionable_improvements"] = parsed_llm_data_commit.pop("actionable_improvements")
-                            commit_info["llm_analysis"] = parsed_llm_data_commit
-                            
-                            pr_data["commits"].append(commit_info)
-
-                        pr_general_comments = github_client.get_comments_for_pull_request(pr)
-                        for comment in pr_general_comments:
-                            print(f"      PR Comment by {comment.user.login}: {comment.body[:50]}...")
-                            pr_data["comments"].append({
-                                "user": comment.user.login,
-                                "body": comment.body
-                            })
-
-                        print(f"  Calling LLM for PR #{pr.number} overall analysis...")
-                        llm_output_raw_pr = analyze_pr_with_llm(
-                            pr.title,
-                            pr.body,
-                            pr_data["commits"],
-                            pr_data["reviews"],
-                            pr_data["comments"]
-                        )
-                        parsed_llm_data_pr = parse_llm_pr_analysis(llm_output_raw_pr)
-                        pr_data["llm_pr_analysis"] = parsed_llm_data_pr
-                        
-                        issue_data["associated_prs"][pr.number] = pr_data
-
-                else:
-                    print(f"  No explicit Pull Requests found linked to Issue #{issue.number} via search or comments.")
-                
+                journaled_issue = journal.take("issue_fetch", issue.number)
+                if journaled_issue is not None:
+                    print(f"\n--- Issue #{issue.number}: {issue.title} already fetched, restoring from journal ---")
+                    issue_data = IssueRecord.from_dict(journaled_issue, diff_store)
+                    work_graph.add_issue(issue_data)
+                    milestone_analysis_results["issues"][issue.number] = issue_data
+                    continue
+
+                print(f"\n--- Fetching Issue #{issue.number}: {issue.title} ---")
+                try:
+                    issue_data = collect_issue_data(github_client, issue, diff_store, work_graph)
+                except Exception as e:
+                    # One bad issue shouldn't abort the whole milestone; record it and move on.
+                    print(f"Warning: Could not fetch Issue #{issue.number}. Error: {e}")
+                    journal.record_failure("issue_fetch", issue.number, e)
+                    milestone_analysis_results["failed_issues"].append({"number": issue.number, "title": issue.title, "error": str(e)})
+                    continue
+                journal.record("issue_fetch", issue.number, issue_data)
+                work_graph.add_issue(issue_data)
                 milestone_analysis_results["issues"][issue.number] = issue_data
-            
+            issues = None # Release the PyGithub issue objects; only records are kept from here on
+            print(f"Spilled {diff_store.spilled_bytes} bytes of large diffs to a temp file.")
+            milestone_analysis_results["work_graph"] = work_graph.stats()
+            graph_stats = milestone_analysis_results["work_graph"]
+            print(f"Work graph: {graph_stats['issues']} issues, {graph_stats['pull_requests']} PRs, {graph_stats['commits']} commits "
+                  f"({graph_stats['duplicate_prs_removed']} duplicate PRs and {graph_stats['duplicate_commits_removed']} duplicate commits removed).")
+
+            # Analyze the riskiest work first so a deadline-limited run still covers what matters most.
+            analysis_queue = build_analysis_queue(milestone_analysis_results["issues"])
+
+            prechecked_commits = {unit["commit"] for unit in analysis_queue if unit["kind"] == "commit" and precheck.check(unit["commit"])}
+            analysis_queue = [unit for unit in analysis_queue if unit["commit"] not in prechecked_commits]
+            milestone_analysis_results["precheck"] = precheck.summary()
+            print(f"Pre-check: {len(prechecked_commits)} trivial commits scored without the LLM {milestone_analysis_results['precheck']['by_category']}.")
+
+            sampled_commits = None
+            if args.sample_rate is not None:
+                # Pre-classified commits have exact scores, so like high-risk commits they form the certainty stratum.
+                high_risk_commits = select_high_risk(milestone_analysis_results["issues"]) | prechecked_commits
+                sampled_commits = select_sample(milestone_analysis_results["issues"], args.sample_rate, high_risk_commits, args.sample_seed)
+                analysis_queue = [unit for unit in analysis_queue if unit["kind"] == "pr" or unit["commit"] in sampled_commits]
+                print(f"\nSampling mode: {len(sampled_commits)} commits selected at rate {args.sample_rate}.")
+            if args.resume:
+                pending_units = apply_journaled_results(analysis_queue, journal)
+                print(f"Restored {len(analysis_queue) - len(pending_units)} completed analyses from the journal.")
+                analysis_queue = pending_units
+            print(f"\nAnalyzing {len(analysis_queue)} commit/PR units in risk order...")
+            # Per-call timeouts and retries are clamped to the time left in the budget.
+            llm_caller.deadline = run_deadline
+            commit_prompt_sizes = {"commits": 0, "chars_before": 0, "chars_after": 0}
+            run_analysis_queue(
+                analysis_queue,
+                {
+                    "commit": partial(analyze_commit_unit, journal=journal, prompt_sizes=commit_prompt_sizes),
+                    "pr": partial(analyze_pr_unit, journal=journal)
+                },
+                deadline=run_deadline,
+                on_error=lambda unit, error: journal.record_failure(*unit_journal_key(unit), error)
+            )
+            # The milestone call runs in the time the queue held back for it.
+            llm_caller.deadline = None
+
+            if commit_prompt_sizes["commits"]:
+                milestone_analysis_results["commit_prompt_size"] = {
+                    "commits": commit_prompt_sizes["commits"],
+                    "avg_chars_all_pr_reviews": round(commit_prompt_sizes["chars_before"] / commit_prompt_sizes["commits"]),
+                    "avg_chars": round(commit_prompt_sizes["chars_after"] / commit_prompt_sizes["commits"])
+                }
+                print(f"Commit prompt size: {milestone_analysis_results['commit_prompt_size']}")
+
+            mark_analysis_status(milestone_analysis_results["issues"])
+            coverage = compute_coverage(milestone_analysis_results["issues"], args.deadline)
+            milestone_analysis_results["coverage"] = coverage
+            if coverage["partial"]:
+                print(f"Partial analysis: {coverage['coverage_ratio']:.0%} of commit/PR units analyzed.")
+            if sampled_commits is not None:
+                milestone_analysis_results["sampling"] = summarize_sampling(
+                    milestone_analysis_results["issues"], args.sample_rate, sampled_commits, high_risk_commits
+                )
+                print(f"Sampling summary: {milestone_analysis_results['sampling']}")
+
             print(f"\nCalling LLM for Milestone '{milestone_to_test}' overall analysis...")
             llm_output_raw_milestone = analyze_milestone_with_llm(
                 milestone_to_test,
-                milestone_analysis_results["issues"]
+                milestone_analysis_results["issues"],
+                coverage,
+                milestone_analysis_results.get("sampling")
             )
-            print(f"LLM Milestone Analysis Result:\n{llm_output_raw_milestone}")
+            if llm_output_raw_milestone is not None:
+                print(f"LLM Milestone Analysis Result:\n{llm_output_raw_milestone}")
+                milestone_analysis_results["llm_milestone_analysis"] = parse_llm_milestone_analysis(llm_output_raw_milestone)
 
-            parsed_llm_data_milestone = parse_llm_milestone_analysis(llm_output_raw_milestone)
-            # Standardize key here:
-            if "actionable_improvements" in parsed_llm_data_milestone:
-                parsed_llm_data_milestone["actionable_improvements"] = parsed_llm_data_milestone.pop("actionable_improvements")
-            milestone_analysis_results["llm_milestone_analysis"] = parsed_llm_data_milestone
+            milestone_analysis_results["llm_call_stats"] = dict(llm_caller.stats)
+            print(f"LLM call stats: {milestone_analysis_results['llm_call_stats']}")
+            milestone_analysis_results["llm_stream_stats"] = stream_stats.summary()
+            print(f"LLM stream timings: {milestone_analysis_results['llm_stream_stats']}")
 
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_filename = f"milestone_{milestone_to_test.replace(' ', '_')}_analysis_{timestamp}.json"
             save_analysis_to_json(milestone_analysis_results, report_filename)
 
+            # --- Append the run to the columnar history used for trend analytics ---
+            if HISTORY_EXPORT_AVAILABLE:
+                try:
+                    export_run(milestone_analysis_results, milestone_analysis_results["repo"], timestamp,
+                               datetime.strptime(timestamp, "%Y%m%d_%H%M%S"))
+                except Exception as e:
+                    print(f"Warning: Could not append run to the history dataset: {e}")
+            else:
+                print("Skipping history export (install pyarrow to enable it).")
+
             # --- Generate and print console report ---
             console_report = generate_console_report(milestone_analysis_results)
             print("\n" + "="*80)
@@ -189,6 +386,8 @@ def main():
             print("="*80)
             print(console_report)
             print("="*80)
+            journal.close()
+            diff_store.close()
 
 
         else:
@@ -200,4 +399,4 @@ def main():
         print(f"An unexpected error occurred: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
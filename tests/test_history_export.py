@@ -0,0 +1,36 @@
+import unittest
+
+from utils.history_export import flatten_run
+
+
+def commit(sha, score=None):
+    return {"sha": sha, "author": "dev", "message": f"change {sha}", "date": "2026-01-01T00:00:00Z",
+            "llm_analysis": {"confidence_score": score} if score is not None else {}}
+
+
+def pr(number, commits):
+    return {"number": number, "title": f"PR {number}", "commits": commits}
+
+
+class FlattenRunTest(unittest.TestCase):
+    def test_shared_prs_and_commits_are_counted_once(self):
+        # PR 10 is linked from both issues; commit "b" is in stacked PRs 10 and 11.
+        shared = pr(10, [commit("a", 80), commit("b", 70)])
+        results = {
+            "milestone_title": "Sprint-1",
+            "issues": {
+                "1": {"number": 1, "associated_prs": {"10": shared}},
+                "2": {"number": 2, "associated_prs": {"10": shared, "11": pr(11, [commit("b", 70), commit("c")])}},
+            },
+        }
+        rows = flatten_run(results, "acme/app", "run", None)
+
+        self.assertEqual(sorted(row["pr_number"] for row in rows["prs"]), [10, 11])
+        self.assertEqual(sorted((row["pr_number"], row["sha"]) for row in rows["commits"]),
+                         [(10, "a"), (10, "b"), (11, "b"), (11, "c")])
+        milestone = rows["milestones"][0]
+        self.assertEqual((milestone["pr_count"], milestone["commit_count"], milestone["commits_analyzed"]), (2, 3, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
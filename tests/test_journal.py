@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from utils.journal import RunJournal
+
+
+class RunJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_take_releases_replayed_result(self):
+        journal = RunJournal(self.path)
+        journal.record("issue_fetch", 7, {"number": 7, "diff": "x" * 1000})
+        journal.close()
+
+        resumed = RunJournal(self.path, resume=True)
+        self.assertEqual(resumed.take("issue_fetch", 7)["number"], 7)
+        self.assertTrue(resumed.is_done("issue_fetch", 7))
+        self.assertIsNone(resumed.take("issue_fetch", 7))
+        self.assertIsNone(resumed.get("issue_fetch", 7))
+        resumed.close()
+
+    def test_torn_last_line_is_ignored(self):
+        journal = RunJournal(self.path)
+        journal.record("commit_analysis", "abc", {"confidence_score": 80})
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"kind": "commit_analysis", "key": "def", "sta')
+
+        resumed = RunJournal(self.path, resume=True)
+        resumed.record("commit_analysis", "def", {"confidence_score": 60})
+        resumed.close()
+
+        replayed = RunJournal(self.path, resume=True)
+        self.assertEqual(replayed.get("commit_analysis", "abc"), {"confidence_score": 80})
+        self.assertEqual(replayed.get("commit_analysis", "def"), {"confidence_score": 60})
+        replayed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
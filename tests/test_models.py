@@ -0,0 +1,46 @@
+import unittest
+
+from utils.diff_store import DiffStore
+from utils.models import CommitRecord, PullRequestRecord, ReviewCommentRecord
+
+
+class ReviewCommentAttributionTest(unittest.TestCase):
+    def setUp(self):
+        self.store = DiffStore()
+        self.pr = PullRequestRecord(1, "PR", "url", "open", "dev", "")
+        self.a = CommitRecord("a", "change X", "dev", "2026-01-01", "+x\n", ["X.java"], self.store)
+        self.b = CommitRecord("b", "change Y", "dev", "2026-01-02", "+y\n", ["Y.java"], self.store)
+        self.pr.commits = [self.a, self.b]
+
+    def tearDown(self):
+        self.store.close()
+
+    def comment(self, commit_id, path):
+        comment = ReviewCommentRecord("reviewer", "nit", commit_id, path, 1)
+        self.pr.review_comments.append(comment)
+        return comment
+
+    def test_comment_at_head_goes_to_commit_that_touched_the_file(self):
+        comment = self.comment("b", "X.java")
+        self.assertEqual(self.pr.review_comments_for(self.a), [comment])
+        self.assertEqual(self.pr.review_comments_for(self.b), [])
+
+    def test_later_commits_are_not_considered(self):
+        self.b.files = ("X.java",)
+        comment = self.comment("a", "X.java")
+        self.assertEqual(self.pr.review_comments_for(self.a), [comment])
+        self.assertEqual(self.pr.review_comments_for(self.b), [])
+
+    def test_comment_after_force_push_matches_by_file(self):
+        comment = self.comment("gone", "Y.java")
+        self.assertEqual(self.pr.review_comments_for(self.b), [comment])
+        self.assertEqual(self.pr.review_comments_for(self.a), [])
+
+    def test_falls_back_to_anchor_commit_when_no_commit_touches_the_file(self):
+        comment = self.comment("b", "Z.java")
+        self.assertEqual(self.pr.review_comments_for(self.b), [comment])
+        self.assertEqual(self.pr.review_comments_for(self.a), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
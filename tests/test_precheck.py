@@ -0,0 +1,71 @@
+import unittest
+
+from utils.diff_store import DiffStore
+from utils.models import CommitRecord
+from utils.precheck import PrecheckRules, classify_commit
+
+
+def make_commit(path, removed, added, store):
+    return make_hunk_commit(path, [f"-{line}" for line in removed] + [f"+{line}" for line in added], store)
+
+
+def make_hunk_commit(path, hunk_lines, store):
+    diff = f"--- a/{path}\n+++ b/{path}\n@@ -1,3 +1,3 @@\n" + "".join(f"{line}\n" for line in hunk_lines)
+    return CommitRecord("a" * 40, "message", "author", "2026-01-01T00:00:00", diff, [path], store)
+
+
+class PrecheckTest(unittest.TestCase):
+    def setUp(self):
+        self.store = DiffStore()
+        self.rules = PrecheckRules()
+
+    def tearDown(self):
+        self.store.close()
+
+    def classify(self, path, removed, added):
+        return classify_commit(make_commit(path, removed, added, self.store), self.rules)
+
+    def classify_hunk(self, path, hunk_lines):
+        return classify_commit(make_hunk_commit(path, hunk_lines, self.store), self.rules)
+
+    def test_source_files_are_never_docs(self):
+        self.assertIsNone(self.classify("src/main/java/com/acme/docs/Exporter.java", ["x = a + b;"], ["x = a - b;"]))
+        self.assertIsNone(self.classify("src/Readme.java", ["a();"], ["b();"]))
+
+    def test_docs(self):
+        self.assertEqual(set(self.classify("docs/guide.md", ["old"], ["new"])), {"docs_only"})
+        self.assertEqual(set(self.classify("README.txt", ["old"], ["new"])), {"docs_only"})
+
+    def test_whitespace_between_tokens_must_remain(self):
+        self.assertIsNone(self.classify("A.java", ["x = a - -b;"], ["x = a--b;"]))
+        self.assertIsNone(self.classify("A.java", ['s = "a b";'], ['s = "ab";']))
+        self.assertEqual(set(self.classify("A.java", ["int  x =  1;  ", "\tfoo();"], ["int x = 1;", "    foo();", ""])),
+                         {"whitespace_only"})
+
+    def test_moved_lines_are_not_whitespace_only(self):
+        self.assertIsNone(self.classify_hunk("src/A.java", ["-    lock.release();", "     process(item);", "+    lock.release();"]))
+
+    def test_project_version_bump(self):
+        self.assertEqual(set(self.classify("package.json", ['  "version": "1.2.3",'], ['  "version": "1.3.0",'])),
+                         {"version_bump"})
+        self.assertEqual(set(self.classify("gradle.properties", ["version=1.2.3"], ["version=1.2.4"])), {"version_bump"})
+        self.assertEqual(set(self.classify("VERSION", ["1.2.3"], ["1.2.4"])), {"version_bump"})
+        self.assertEqual(set(self.classify_hunk("pom.xml", [
+            "     <artifactId>app</artifactId>", "-    <version>1.2.3</version>", "+    <version>1.3.0</version>",
+            "     <packaging>jar</packaging>"
+        ])), {"version_bump"})
+
+    def test_dependency_and_setting_changes_are_not_version_bumps(self):
+        self.assertIsNone(self.classify_hunk("package.json", [
+            '   "dependencies": {', '-    "react": "17.0.2",', '+    "react": "18.2.0",'
+        ]))
+        self.assertIsNone(self.classify("gradle.properties", ["http.timeout=0.5"], ["http.timeout=30.0"]))
+        self.assertIsNone(self.classify_hunk("pom.xml", [
+            "         <dependency>", "             <artifactId>guava</artifactId>",
+            "-            <version>31.1</version>", "+            <version>33.0</version>"
+        ]))
+        self.assertIsNone(self.classify_hunk("Cargo.toml", [" [dependencies.serde]", '-version = "1.0.100"', '+version = "2.0.0"']))
+
+
+if __name__ == "__main__":
+    unittest.main()
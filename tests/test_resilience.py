@@ -0,0 +1,81 @@
+import time
+import unittest
+from unittest import mock
+
+from llm_agent.resilience import CircuitBreaker, CircuitOpenError, LLMCallTimeout, ResilientCaller
+
+
+class StatusError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def raise_status(code):
+    def fn():
+        raise StatusError(code)
+    return fn
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_non_retryable_error_in_half_open_trial_closes_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.0)
+        caller = ResilientCaller(call_timeout=5, max_retries=0, hedging=False, circuit_breaker=breaker)
+
+        with self.assertRaises(StatusError):
+            caller.call(raise_status(503))
+        self.assertEqual(breaker.state, "open")
+
+        # Cooldown has elapsed: the half-open trial gets a 400 back.
+        with self.assertRaises(StatusError):
+            caller.call(raise_status(400))
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(caller.call(lambda: "ok"), "ok")
+
+    def test_open_breaker_rejects_calls_until_cooldown(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=60.0)
+        caller = ResilientCaller(call_timeout=5, max_retries=0, hedging=False, circuit_breaker=breaker)
+        with self.assertRaises(StatusError):
+            caller.call(raise_status(503))
+        with self.assertRaises(CircuitOpenError):
+            caller.call(lambda: "ok")
+
+
+class RunDeadlineTest(unittest.TestCase):
+    def test_attempt_timeout_is_clamped_to_deadline(self):
+        caller = ResilientCaller(call_timeout=60, hedging=False)
+        self.assertEqual(caller.attempt_timeout(), 60)
+        caller.deadline = time.monotonic() + 0.2
+        self.assertLessEqual(caller.attempt_timeout(), 0.2)
+
+        start = time.monotonic()
+        with self.assertRaises(LLMCallTimeout):
+            caller.call(lambda: time.sleep(1))
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_no_call_after_deadline(self):
+        caller = ResilientCaller(call_timeout=60, hedging=False)
+        caller.deadline = time.monotonic() - 1
+        with self.assertRaises(LLMCallTimeout):
+            caller.call(lambda: "ok")
+        self.assertEqual(caller.stats["attempts"], 0)
+
+    def test_no_retry_when_backoff_overruns_deadline(self):
+        caller = ResilientCaller(call_timeout=60, max_retries=3, hedging=False)
+        caller.deadline = time.monotonic() + 5
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise StatusError(503)
+
+        with mock.patch("llm_agent.resilience.random.uniform", return_value=10.0), \
+                mock.patch("llm_agent.resilience.time.sleep") as sleep:
+            with self.assertRaises(StatusError):
+                caller.call(fn)
+        self.assertEqual(len(calls), 1)
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from utils.diff_store import DiffStore
+from utils.models import CommitRecord, IssueRecord, PullRequestRecord
+from utils.sampling import estimate_scores, select_sample
+from utils.scheduler import STATUS_ANALYZED
+
+
+class SamplingEstimateTest(unittest.TestCase):
+    def setUp(self):
+        self.store = DiffStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def build_milestone(self):
+        """
+        50 one-commit PRs scoring around 50 and 10 sixty-commit PRs scoring around 85.
+        Returns the issues and the true score of every commit.
+        """
+        issue = IssueRecord(1, "issue", "url", "open")
+        true_scores = {}
+        sizes = [1] * 50 + [60] * 10
+        for number, size in enumerate(sizes, 1):
+            pr = PullRequestRecord(number, f"PR {number}", "url", "open", "dev", "")
+            for i in range(size):
+                sha = f"{number}-{i}"
+                pr.commits.append(CommitRecord(sha, "msg", "dev", "2026-01-01", "+x\n", ["src/A.java"], self.store))
+                true_scores[sha] = (50 if size == 1 else 85) + (i % 7) - 3
+            issue.associated_prs[number] = pr
+        return {1: issue}, true_scores
+
+    def test_milestone_estimate_is_unbiased_with_uneven_pr_sizes(self):
+        covered = 0
+        for seed in range(20):
+            issues, true_scores = self.build_milestone()
+            true_mean = sum(true_scores.values()) / len(true_scores)
+            for commit in select_sample(issues, 0.05, set(), seed):
+                commit.analysis_status = STATUS_ANALYZED
+                commit.llm_analysis = {"confidence_score": true_scores[commit.sha]}
+
+            estimate = estimate_scores(issues, set())
+
+            self.assertAlmostEqual(estimate["mean"], true_mean, delta=2)
+            self.assertEqual(estimate["commits_total"], len(true_scores))
+            # Interval bounds are rounded to one decimal.
+            covered += estimate["ci_low"] - 0.05 <= true_mean <= estimate["ci_high"] + 0.05
+        self.assertGreaterEqual(covered, 17)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from utils.diff_store import DiffStore
+from utils.models import CommitRecord, IssueRecord, PullRequestRecord
+from utils.scheduler import build_analysis_queue, run_analysis_queue
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.store = DiffStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def make_pr(self, number, state, diff_sizes):
+        pr = PullRequestRecord(number, f"PR {number}", "url", state, "dev", "")
+        pr.commits = [
+            CommitRecord(f"{number}-{i}", "msg", "dev", "2026-01-01", "+x\n" * lines, [f"pkg{number}/F{i}.java"], self.store)
+            for i, lines in enumerate(diff_sizes)
+        ]
+        return pr
+
+    def build_issues(self):
+        issue = IssueRecord(1, "issue", "url", "open")
+        # PR 2 is open (riskier); within each PR the larger diff is riskier.
+        for pr in (self.make_pr(1, "closed", [10, 400]), self.make_pr(2, "open", [300, 20])):
+            issue.associated_prs[pr.number] = pr
+        return {1: issue}
+
+    def test_queue_is_in_risk_order_with_pr_after_its_commits(self):
+        queue = build_analysis_queue(self.build_issues())
+        order = [(unit["kind"], unit["pr"].number, unit["commit"].sha if unit["commit"] else None) for unit in queue]
+        self.assertEqual(order, [
+            ("commit", 2, "2-0"), ("commit", 2, "2-1"), ("pr", 2, None),
+            ("commit", 1, "1-1"), ("commit", 1, "1-0"), ("pr", 1, None),
+        ])
+
+    def test_units_past_the_deadline_are_skipped(self):
+        queue = build_analysis_queue(self.build_issues())
+        clock = [100.0]
+        done = []
+
+        def handler(unit):
+            done.append(unit)
+            clock[0] += 10
+
+        with mock.patch("utils.scheduler.time.monotonic", side_effect=lambda: clock[0]):
+            completed = run_analysis_queue(queue, {"commit": handler, "pr": handler}, deadline=125.0)
+        # After two 10s units, holding back the average unit time would overrun the deadline.
+        self.assertEqual(completed, 2)
+        self.assertEqual(done, queue[:2])
+
+    def test_no_deadline_runs_everything(self):
+        queue = build_analysis_queue(self.build_issues())
+        self.assertEqual(run_analysis_queue(queue, {"commit": lambda unit: None, "pr": lambda unit: None}), len(queue))
+
+
+if __name__ == "__main__":
+    unittest.main()
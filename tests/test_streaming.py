@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+
+from llm_agent.streaming import OutputLimits, consume_stream
+
+RESPONSE = (
+    "Confidence Score: 85\n"
+    "Justification: Small, focused change with tests.\n"
+    "Actionable Improvements:\n"
+    "- Add a changelog entry.\n"
+    "- Document the new flag.\n"
+    "- Cover the error path.\n"
+)
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class ConsumeStreamTest(unittest.TestCase):
+    def test_cuts_off_after_the_last_wanted_bullet(self):
+        result = consume_stream(chunked(RESPONSE, 7), "commit", OutputLimits(512, 120, 2))
+        self.assertTrue(result.cut_off)
+        self.assertTrue(result.text.endswith("- Document the new flag.\n"))
+        self.assertNotIn("Cover the error path", result.text)
+        self.assertIsNotNone(result.time_to_score)
+
+    def test_reads_to_the_end_with_fewer_bullets_than_the_limit(self):
+        result = consume_stream(chunked(RESPONSE, 5), "commit", OutputLimits(512, 120, 5))
+        self.assertFalse(result.cut_off)
+        self.assertEqual(result.text, RESPONSE)
+
+    def test_partial_bullet_is_not_counted(self):
+        chunks = ["Confidence Score: 70\nActionable Improvements:\n- One.\n- Tw", "o.\n- Three.\n"]
+        result = consume_stream(chunks, "commit", OutputLimits(512, 120, 2))
+        self.assertTrue(result.cut_off)
+        self.assertEqual(result.text, "Confidence Score: 70\nActionable Improvements:\n- One.\n- Two.\n")
+
+    def test_score_split_across_chunks(self):
+        # "8" alone could still become "85": the score only counts once a non-digit follows.
+        chunks = ["Release Readiness Score: 8", "5", "\nJustification: ok."]
+        clock = [0]
+
+        def stream():
+            for chunk in chunks:
+                clock[0] += 1
+                yield chunk
+
+        with mock.patch("llm_agent.streaming.time.monotonic", side_effect=lambda: clock[0]):
+            result = consume_stream(stream(), "pr", OutputLimits(768, 120, 5), started_at=0)
+        self.assertEqual(result.text, "".join(chunks))
+        self.assertEqual(result.time_to_first_token, 1)
+        self.assertEqual(result.time_to_score, 3)
+
+    def test_no_score_leaves_time_to_score_unset(self):
+        result = consume_stream(["Justification: nothing to score.\n"], "commit", OutputLimits(512, 120, 5))
+        self.assertIsNone(result.time_to_score)
+        self.assertIsNotNone(result.time_to_first_token)
+        self.assertFalse(result.cut_off)
+
+    def test_empty_stream(self):
+        result = consume_stream([], "milestone", OutputLimits(1536, 120, 5))
+        self.assertEqual(result.text, "")
+        self.assertIsNone(result.time_to_first_token)
+        self.assertIsNone(result.time_to_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
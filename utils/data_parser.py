@@ -1,6 +1,7 @@
 import re
 import json
 import os
+from utils.models import encode_record
 
 def parse_llm_commit_analysis(llm_output_text):
     # ... (Keep this function as it is) ...
@@ -131,12 +132,13 @@ def parse_llm_milestone_analysis(llm_output_text):
 def save_analysis_to_json(data, filename="analysis_report.json", output_dir="reports"):
     """
     Saves the aggregated analysis data to a JSON file.
-    Ensures the output directory exists.
+    Ensures the output directory exists. Records from utils.models are encoded
+    one at a time, so spilled diffs are never all loaded at once.
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     filepath = os.path.join(output_dir, filename)
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+        json.dump(data, f, indent=4, ensure_ascii=False, default=encode_record)
     print(f"Analysis report saved to {filepath}")
\ No newline at end of file
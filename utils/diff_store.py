@@ -0,0 +1,66 @@
+import tempfile
+import threading
+
+# Diffs at or below this many bytes are kept in memory; larger ones are spilled.
+INLINE_DIFF_MAX_BYTES = 4096
+
+
+class DiffRef:
+    """
+    Location of a spilled diff inside a DiffStore's temp file.
+    """
+    __slots__ = ("offset", "length")
+
+    def __init__(self, offset, length):
+        self.offset = offset
+        self.length = length
+
+
+class DiffStore:
+    """
+    Append-only spill file for large diff bodies.
+
+    `put` returns a handle: the diff string itself when it is small, otherwise a
+    DiffRef pointing into an anonymous temp file. Diffs are only read back (by
+    offset) while a prompt or report entry is being built, so memory use no
+    longer grows with the sum of all diffs in the milestone.
+    """
+
+    def __init__(self, inline_max_bytes=INLINE_DIFF_MAX_BYTES):
+        self.inline_max_bytes = inline_max_bytes
+        self._file = tempfile.TemporaryFile(prefix="release_agent_diffs_")
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, diff):
+        data = diff.encode("utf-8")
+        if len(data) <= self.inline_max_bytes:
+            return diff
+        with self._lock:
+            self._file.seek(self._size)
+            self._file.write(data)
+            ref = DiffRef(self._size, len(data))
+            self._size += len(data)
+        return ref
+
+    def get(self, handle, max_chars=None):
+        """
+        Loads a diff by handle. `max_chars` reads only the start of the diff.
+        """
+        if not isinstance(handle, DiffRef):
+            return handle if max_chars is None else handle[:max_chars]
+
+        # A UTF-8 character is at most 4 bytes, so this is enough for max_chars characters.
+        length = handle.length if max_chars is None else min(handle.length, max_chars * 4)
+        with self._lock:
+            self._file.seek(handle.offset)
+            data = self._file.read(length)
+        text = data.decode("utf-8", errors="ignore")
+        return text if max_chars is None else text[:max_chars]
+
+    @property
+    def spilled_bytes(self):
+        return self._size
+
+    def close(self):
+        self._file.close()
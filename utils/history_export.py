@@ -0,0 +1,320 @@
+"""
+Columnar run history for trend analytics.
+
+Each run is flattened into four tables (milestones, issues, prs, commits) and
+appended as zstd-compressed Parquet files to a Hive-partitioned dataset under
+reports/history/<table>/repo=<repo>/milestone=<milestone>/. Existing files
+are never rewritten, so appending a run is cheap, and filtered scans by repo
+and milestone only open the matching partitions. Author and date filters are
+pushed down to Parquet row-group statistics.
+
+pyarrow is listed in requirements.txt. If it isn't installed, main.py skips the export.
+
+    python -m utils.history_export --backfill reports/      # import existing JSON reports
+    python -m utils.history_export --trend --milestone Sprint-1
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+HISTORY_EXPORT_AVAILABLE = pa is not None
+DEFAULT_HISTORY_DIR = os.path.join("reports", "history")
+TABLES = ("milestones", "issues", "prs", "commits")
+
+if HISTORY_EXPORT_AVAILABLE:
+    _COMMON_FIELDS = [
+        ("run_id", pa.string()),
+        ("run_timestamp", pa.timestamp("s")),
+        ("repo", pa.string()),
+        ("milestone", pa.string()),
+    ]
+    SCHEMAS = {
+        "milestones": pa.schema(_COMMON_FIELDS + [
+            ("release_confidence_score", pa.int32()),
+            ("issue_count", pa.int32()),
+            ("pr_count", pa.int32()),
+            ("commit_count", pa.int32()),
+            ("commits_analyzed", pa.int32()),
+            ("coverage_ratio", pa.float64()),
+            ("partial", pa.bool_()),
+            ("sample_rate", pa.float64()),
+            ("estimated_commit_score", pa.float64()),
+            ("llm_calls", pa.int32()),
+        ]),
+        "issues": pa.schema(_COMMON_FIELDS + [
+            ("issue_number", pa.int32()),
+            ("title", pa.string()),
+            ("state", pa.string()),
+            ("comment_count", pa.int32()),
+            ("pr_count", pa.int32()),
+        ]),
+        "prs": pa.schema(_COMMON_FIELDS + [
+            ("issue_number", pa.int32()),
+            ("pr_number", pa.int32()),
+            ("title", pa.string()),
+            ("state", pa.string()),
+            ("author", pa.string()),
+            ("release_readiness_score", pa.int32()),
+            ("risk_score", pa.float64()),
+            ("analysis_status", pa.string()),
+            ("commit_count", pa.int32()),
+            ("review_count", pa.int32()),
+            ("changes_requested", pa.bool_()),
+            ("estimated_commit_score", pa.float64()),
+        ]),
+        "commits": pa.schema(_COMMON_FIELDS + [
+            ("issue_number", pa.int32()),
+            ("pr_number", pa.int32()),
+            ("sha", pa.string()),
+            ("author", pa.string()),
+            ("commit_date", pa.timestamp("s", tz="UTC")),
+            ("subject", pa.string()),
+            ("confidence_score", pa.int32()),
+            ("risk_score", pa.float64()),
+            ("analysis_status", pa.string()),
+            ("diff_lines", pa.int32()),
+            ("files_changed", pa.int32()),
+            ("improvement_count", pa.int32()),
+        ]),
+    }
+
+
+def _require_pyarrow():
+    if not HISTORY_EXPORT_AVAILABLE:
+        raise ImportError("pyarrow is required for history export. Install it with: pip install pyarrow")
+
+
+def _get(obj, name, default=None):
+    """
+    Reads a field from a utils.models record or from its JSON dict form.
+    """
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def flatten_run(results, repo, run_id, run_timestamp):
+    """
+    Flattens one run's results (records or a loaded JSON report) into
+    per-table lists of row dicts.
+
+    A PR linked from several issues gets one row, attributed to the first
+    issue, and a commit gets one row per PR containing it. Shared nodes are
+    keyed by PR number and SHA rather than record identity, because a JSON
+    report holds a separate copy of them under every parent.
+    """
+    common = {"run_id": run_id, "run_timestamp": run_timestamp, "repo": repo, "milestone": results.get("milestone_title")}
+    rows = {table: [] for table in TABLES}
+    seen_prs = set()
+    seen_commits = set()
+    # Milestone aggregates count each commit once, even when stacked PRs share it.
+    commit_scores = {}
+
+    for issue_number, issue in results.get("issues", {}).items():
+        prs = _get(issue, "associated_prs", {})
+        rows["issues"].append(dict(common,
+            issue_number=int(_get(issue, "number", issue_number)),
+            title=_get(issue, "title"),
+            state=_get(issue, "state"),
+            comment_count=len(_get(issue, "comments", [])),
+            pr_count=len(prs)
+        ))
+        for pr in prs.values():
+            if _get(pr, "number") in seen_prs:
+                continue
+            seen_prs.add(_get(pr, "number"))
+            commits = _get(pr, "commits", [])
+            pr_analysis = _get(pr, "llm_pr_analysis", {}) or {}
+            pr_estimate = _get(pr, "commit_score_estimate") or {}
+            rows["prs"].append(dict(common,
+                issue_number=int(_get(issue, "number", issue_number)),
+                pr_number=_get(pr, "number"),
+                title=_get(pr, "title"),
+                state=_get(pr, "state"),
+                author=_get(pr, "user"),
+                release_readiness_score=pr_analysis.get("release_readiness_score"),
+                risk_score=_get(pr, "risk_score"),
+                analysis_status=_get(pr, "analysis_status"),
+                commit_count=len(commits),
+                review_count=len(_get(pr, "reviews", [])),
+                changes_requested=_get(pr, "changes_requested"),
+                estimated_commit_score=pr_estimate.get("mean")
+            ))
+            for commit in commits:
+                if (_get(pr, "number"), _get(commit, "sha")) in seen_commits:
+                    continue
+                seen_commits.add((_get(pr, "number"), _get(commit, "sha")))
+                commit_analysis = _get(commit, "llm_analysis", {}) or {}
+                commit_scores[_get(commit, "sha")] = commit_analysis.get("confidence_score")
+                diff_lines = _get(commit, "diff_lines")
+                if diff_lines is None:
+                    diff_lines = (_get(commit, "diff") or "").count("\n")
+                message = _get(commit, "message") or ""
+                rows["commits"].append(dict(common,
+                    issue_number=int(_get(issue, "number", issue_number)),
+                    pr_number=_get(pr, "number"),
+                    sha=_get(commit, "sha"),
+                    author=_get(commit, "author"),
+                    commit_date=_parse_timestamp(_get(commit, "date")),
+                    subject=message.splitlines()[0] if message else "",
+                    confidence_score=commit_analysis.get("confidence_score"),
+                    risk_score=_get(commit, "risk_score"),
+                    analysis_status=_get(commit, "analysis_status"),
+                    diff_lines=diff_lines,
+                    files_changed=len(_get(commit, "files") or ()),
+                    improvement_count=len(commit_analysis.get("actionable_improvements", []))
+                ))
+
+    milestone_analysis = results.get("llm_milestone_analysis", {}) or {}
+    coverage = results.get("coverage", {}) or {}
+    sampling = results.get("sampling", {}) or {}
+    rows["milestones"].append(dict(common,
+        release_confidence_score=milestone_analysis.get("release_confidence_score"),
+        issue_count=len(rows["issues"]),
+        pr_count=len(rows["prs"]),
+        commit_count=len(commit_scores),
+        commits_analyzed=sum(1 for score in commit_scores.values() if score is not None),
+        coverage_ratio=coverage.get("coverage_ratio"),
+        partial=coverage.get("partial"),
+        sample_rate=sampling.get("sample_rate"),
+        estimated_commit_score=(sampling.get("estimated_commit_score") or {}).get("mean"),
+        llm_calls=(results.get("llm_call_stats") or {}).get("calls")
+    ))
+    return rows
+
+
+def export_run(results, repo, run_id, run_timestamp, history_dir=DEFAULT_HISTORY_DIR):
+    """
+    Appends one run to the history dataset as new Parquet files (one per table and partition).
+    """
+    _require_pyarrow()
+    rows = flatten_run(results, repo, run_id, run_timestamp)
+    for table, table_rows in rows.items():
+        if not table_rows:
+            continue
+        ds.write_dataset(
+            pa.Table.from_pylist(table_rows, schema=SCHEMAS[table]),
+            os.path.join(history_dir, table),
+            format="parquet",
+            partitioning=["repo", "milestone"],
+            partitioning_flavor="hive",
+            basename_template=f"run-{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd")
+        )
+    print(f"Appended run {run_id} to history dataset {history_dir} "
+          f"({len(rows['commits'])} commits, {len(rows['prs'])} PRs, {len(rows['issues'])} issues).")
+
+
+def scan_history(table, history_dir=DEFAULT_HISTORY_DIR, repo=None, milestone=None, author=None,
+                 since=None, until=None, columns=None):
+    """
+    Loads a history table as a pyarrow.Table, filtered by repo, milestone,
+    author (prs/commits) and date range (commit_date for commits, run time otherwise).
+    """
+    _require_pyarrow()
+    path = os.path.join(history_dir, table)
+    if not os.path.isdir(path):
+        return pa.Table.from_pylist([], schema=SCHEMAS[table])
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive", schema=SCHEMAS[table])
+    conditions = []
+    if repo is not None:
+        conditions.append(ds.field("repo") == repo)
+    if milestone is not None:
+        conditions.append(ds.field("milestone") == milestone)
+    if author is not None:
+        conditions.append(ds.field("author") == author)
+    date_column = "commit_date" if table == "commits" else "run_timestamp"
+    date_type = SCHEMAS[table].field(date_column).type
+    if since is not None:
+        conditions.append(ds.field(date_column) >= pa.scalar(since, type=date_type))
+    if until is not None:
+        conditions.append(ds.field(date_column) <= pa.scalar(until, type=date_type))
+
+    row_filter = None
+    for condition in conditions:
+        row_filter = condition if row_filter is None else row_filter & condition
+    return dataset.to_table(columns=columns, filter=row_filter)
+
+
+def milestone_score_trend(history_dir=DEFAULT_HISTORY_DIR, repo=None, milestone=None):
+    """
+    Release confidence score per run, oldest first.
+    """
+    table = scan_history("milestones", history_dir, repo=repo, milestone=milestone,
+                         columns=["run_timestamp", "repo", "milestone", "release_confidence_score",
+                                  "coverage_ratio", "commit_count"])
+    return table.sort_by("run_timestamp").to_pylist()
+
+
+def _run_info_from_filename(path):
+    match = re.search(r"_analysis_(\d{8}_\d{6})\.json$", path)
+    if not match:
+        return None, None
+    return match.group(1), datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+
+
+def backfill(reports_dir, repo, history_dir=DEFAULT_HISTORY_DIR):
+    """
+    Exports existing JSON analysis reports that are not in the history yet.
+    """
+    _require_pyarrow()
+    exported_runs = set(scan_history("milestones", history_dir, columns=["run_id"]).column("run_id").to_pylist())
+    for path in sorted(glob.glob(os.path.join(reports_dir, "milestone_*_analysis_*.json"))):
+        with open(path, encoding='utf-8') as f:
+            results = json.load(f)
+        run_id = results.get("run_id")
+        run_timestamp = _parse_timestamp(results.get("generated_at"))
+        if run_id is None:
+            run_id, run_timestamp = _run_info_from_filename(path)
+        if run_id is None or run_id in exported_runs:
+            continue
+        export_run(results, results.get("repo", repo), run_id, run_timestamp, history_dir)
+        exported_runs.add(run_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and query the columnar run history.")
+    parser.add_argument("--history-dir", default=DEFAULT_HISTORY_DIR)
+    parser.add_argument("--backfill", metavar="REPORTS_DIR", help="Import existing JSON reports from this directory.")
+    parser.add_argument("--trend", action="store_true", help="Print the milestone score trend.")
+    parser.add_argument("--repo", default=None, help="owner/name (defaults to GITHUB_REPO_OWNER/GITHUB_REPO_NAME for --backfill).")
+    parser.add_argument("--milestone", default=None)
+    args = parser.parse_args()
+
+    if args.backfill:
+        repo = args.repo or f"{os.getenv('GITHUB_REPO_OWNER', 'unknown')}/{os.getenv('GITHUB_REPO_NAME', 'unknown')}"
+        backfill(args.backfill, repo, args.history_dir)
+    if args.trend:
+        start = time.perf_counter()
+        trend = milestone_score_trend(args.history_dir, args.repo, args.milestone)
+        elapsed = time.perf_counter() - start
+        for row in trend:
+            print(f"{row['run_timestamp']}  {row['repo']}  {row['milestone']}  "
+                  f"score={row['release_confidence_score']}  coverage={row['coverage_ratio']}  commits={row['commit_count']}")
+        print(f"{len(trend)} runs in {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
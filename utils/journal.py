@@ -0,0 +1,104 @@
+import json
+import os
+
+from utils.models import encode_record
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+# Stands in for a result that has been handed out by RunJournal.take().
+_TAKEN = object()
+
+
+class RunJournal:
+    """
+    Write-ahead journal of completed units of work for one milestone run.
+
+    Each line is a JSON object {"kind", "key", "status", "result"|"error"}
+    appended and fsynced as soon as the unit finishes, so a crash loses at most
+    the unit in flight. With `resume=True` the existing journal is replayed and
+    units already done can be skipped; otherwise a fresh journal is started.
+    A torn last line (crash mid-write) is ignored on replay.
+
+    Large replayed results (whole issues with their diffs) should be
+    restored with take(), which releases the journal's copy.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._done = {}
+        self.failed = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        torn_tail = False
+        if resume and os.path.exists(path):
+            torn_tail = self._replay()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if torn_tail:
+            # Start appending on a fresh line after a partially written entry.
+            self._file.write("\n")
+
+    def _replay(self):
+        """
+        Loads completed and failed units. Returns True if the file ends mid-line.
+        """
+        last_line = ""
+        with open(self.path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                last_line = line
+                if line.strip():
+                    self._replay_line(line_number, line)
+        print(f"Resuming from journal {self.path}: {len(self._done)} completed and {len(self.failed)} failed units found.")
+        return bool(last_line) and not last_line.endswith("\n")
+
+    def _replay_line(self, line_number, line):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"Warning: Ignoring unreadable journal line {line_number} in {self.path}.")
+            return
+        unit = (entry["kind"], entry["key"])
+        if entry["status"] == STATUS_DONE:
+            self._done[unit] = entry.get("result")
+            self.failed.pop(unit, None)
+        else:
+            self.failed[unit] = entry.get("error")
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=encode_record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def get(self, kind, key):
+        """
+        Returns the recorded result of a completed unit, or None if it still has
+        to run or its result was already taken.
+        """
+        result = self._done.get((kind, str(key)))
+        return None if result is _TAKEN else result
+
+    def take(self, kind, key):
+        """
+        Like get(), but hands the result over: the journal keeps only a done
+        marker, so the caller's restored copy is the only one in memory.
+        """
+        unit = (kind, str(key))
+        result = self._done.get(unit)
+        if result is None or result is _TAKEN:
+            return None
+        self._done[unit] = _TAKEN
+        return result
+
+    def is_done(self, kind, key):
+        return (kind, str(key)) in self._done
+
+    def record(self, kind, key, result):
+        # Callers keep their own reference to the result, so holding it here costs nothing extra.
+        self._done[(kind, str(key))] = result
+        self.failed.pop((kind, str(key)), None)
+        self._append({"kind": kind, "key": str(key), "status": STATUS_DONE, "result": result})
+
+    def record_failure(self, kind, key, error):
+        self.failed[(kind, str(key))] = str(error)
+        self._append({"kind": kind, "key": str(key), "status": STATUS_FAILED, "error": str(error)})
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,273 @@
+"""
+Compact in-memory records for milestone data.
+
+PyGithub objects keep their full raw JSON payload alive, so the agent copies
+only the fields it uses into these `__slots__` records as soon as an object is
+fetched. Commit diffs live in a DiffStore and are loaded on demand.
+`to_dict()` produces the same shape that is written to the JSON report, and
+`from_dict()` rebuilds the fetched fields from it (used when resuming a run).
+"""
+
+
+def encode_record(obj):
+    """
+    `default=` hook for json.dump. json.dump encodes incrementally, so each
+    record (and its diff) is materialized only while it is being written.
+    """
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class CommentRecord:
+    __slots__ = ("user", "body")
+
+    def __init__(self, user, body):
+        self.user = user
+        self.body = body or ""
+
+    @classmethod
+    def from_github(cls, comment):
+        return cls(comment.user.login, comment.body)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["user"], data["body"])
+
+    def to_dict(self):
+        return {"user": self.user, "body": self.body}
+
+
+class ReviewRecord:
+    __slots__ = ("user", "state", "body")
+
+    def __init__(self, user, state, body):
+        self.user = user
+        self.state = state
+        self.body = body or ""
+
+    @classmethod
+    def from_github(cls, review):
+        return cls(review.user.login, review.state, review.body)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["user"], data["state"], data["body"])
+
+    def to_dict(self):
+        return {"user": self.user, "state": self.state, "body": self.body}
+
+
+class ReviewCommentRecord:
+    """
+    An inline review comment, anchored to the commit the reviewer saw and a file/line in its diff.
+    """
+    __slots__ = ("user", "body", "commit_id", "path", "line")
+
+    def __init__(self, user, body, commit_id, path, line):
+        self.user = user
+        self.body = body or ""
+        self.commit_id = commit_id
+        self.path = path
+        self.line = line
+
+    @classmethod
+    def from_github(cls, comment):
+        # original_* point at the commit and line the comment was written on;
+        # commit_id/line move along with later pushes.
+        return cls(
+            comment.user.login,
+            comment.body,
+            comment.original_commit_id or comment.commit_id,
+            comment.path,
+            comment.original_line or comment.line
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["user"], data["body"], data["commit_id"], data["path"], data["line"])
+
+    def to_dict(self):
+        return {"user": self.user, "body": self.body, "commit_id": self.commit_id, "path": self.path, "line": self.line}
+
+
+class CommitRecord:
+    __slots__ = (
+        "sha", "message", "author", "date", "files",
+        "diff_handle", "diff_lines", "store",
+        "llm_analysis", "risk_score", "analysis_status"
+    )
+
+    def __init__(self, sha, message, author, date, diff, files, store):
+        self.sha = sha
+        self.message = message
+        self.author = author
+        self.date = date
+        self.files = tuple(files)
+        self.store = store
+        self.diff_handle = store.put(diff)
+        self.diff_lines = diff.count("\n")
+        self.llm_analysis = {}
+        self.risk_score = None
+        self.analysis_status = None
+
+    @classmethod
+    def from_client_dict(cls, commit_dict, store):
+        """
+        Builds a record from a dict returned by GitHubClient.get_commits_for_pull_request.
+        """
+        return cls(
+            commit_dict["sha"],
+            commit_dict["message"],
+            commit_dict["author"],
+            commit_dict["date"],
+            commit_dict["diff"],
+            commit_dict["files"],
+            store
+        )
+
+    @classmethod
+    def from_dict(cls, data, store):
+        return cls.from_client_dict(data, store)
+
+    @property
+    def diff(self):
+        return self.store.get(self.diff_handle)
+
+    def diff_snippet(self, max_chars):
+        return self.store.get(self.diff_handle, max_chars)
+
+    @property
+    def subject(self):
+        lines = self.message.splitlines()
+        return lines[0] if lines else ""
+
+    def to_dict(self):
+        return {
+            "sha": self.sha,
+            "message": self.message,
+            "author": self.author,
+            "date": self.date,
+            "diff": self.diff,
+            "files": list(self.files),
+            "llm_analysis": self.llm_analysis,
+            "risk_score": self.risk_score,
+            "analysis_status": self.analysis_status
+        }
+
+
+class PullRequestRecord:
+    __slots__ = (
+        "number", "title", "url", "state", "user", "description",
+        "commits", "reviews", "review_comments", "comments", "changes_requested",
+        "llm_pr_analysis", "risk_score", "analysis_status", "commit_score_estimate"
+    )
+
+    def __init__(self, number, title, url, state, user, description):
+        self.number = number
+        self.title = title
+        self.url = url
+        self.state = state
+        self.user = user
+        self.description = description or ""
+        self.commits = []
+        self.reviews = []
+        self.review_comments = []
+        self.comments = []
+        self.changes_requested = False
+        self.llm_pr_analysis = {}
+        self.risk_score = None
+        self.analysis_status = None
+        self.commit_score_estimate = None
+
+    @classmethod
+    def from_github(cls, pr):
+        return cls(pr.number, pr.title, pr.html_url, pr.state, pr.user.login, pr.body)
+
+    @classmethod
+    def from_dict(cls, data, store):
+        pr = cls(data["number"], data["title"], data["url"], data["state"], data["user"], data["description"])
+        pr.commits = [CommitRecord.from_dict(commit, store) for commit in data["commits"]]
+        pr.reviews = [ReviewRecord.from_dict(review) for review in data["reviews"]]
+        pr.review_comments = [ReviewCommentRecord.from_dict(comment) for comment in data.get("review_comments", [])]
+        pr.comments = [CommentRecord.from_dict(comment) for comment in data["comments"]]
+        pr.changes_requested = data.get("changes_requested", False)
+        return pr
+
+    def _comment_target(self, comment):
+        """
+        The SHA of the commit an inline comment refers to: the most recent
+        commit, at or before the one it was written on, that touches its file.
+
+        `commit_id` is the PR head when the comment was written, usually the
+        last commit, so on its own it says little about which commit changed
+        the line. Comments anchored outside the PR (e.g. after a force push)
+        are matched against every commit. Falls back to `commit_id` when no
+        commit touches the file.
+        """
+        shas = [c.sha for c in self.commits]
+        candidates = self.commits[:shas.index(comment.commit_id) + 1] if comment.commit_id in shas else self.commits
+        for commit in reversed(candidates):
+            if comment.path in commit.files:
+                return commit.sha
+        return comment.commit_id
+
+    def review_comments_for(self, commit):
+        """
+        Inline review comments that refer to `commit` (see _comment_target).
+        """
+        return [comment for comment in self.review_comments if self._comment_target(comment) == commit.sha]
+
+    def to_dict(self):
+        return {
+            "number": self.number,
+            "title": self.title,
+            "url": self.url,
+            "state": self.state,
+            "user": self.user,
+            "description": self.description,
+            "commits": self.commits,
+            "reviews": self.reviews,
+            "review_comments": self.review_comments,
+            "comments": self.comments,
+            "changes_requested": self.changes_requested,
+            "llm_pr_analysis": self.llm_pr_analysis,
+            "risk_score": self.risk_score,
+            "analysis_status": self.analysis_status,
+            "commit_score_estimate": self.commit_score_estimate
+        }
+
+
+class IssueRecord:
+    __slots__ = ("number", "title", "url", "state", "comments", "associated_prs")
+
+    def __init__(self, number, title, url, state):
+        self.number = number
+        self.title = title
+        self.url = url
+        self.state = state
+        self.comments = []
+        self.associated_prs = {}
+
+    @classmethod
+    def from_github(cls, issue):
+        return cls(issue.number, issue.title, issue.html_url, issue.state)
+
+    @classmethod
+    def from_dict(cls, data, store):
+        issue = cls(data["number"], data["title"], data["url"], data["state"])
+        issue.comments = [CommentRecord.from_dict(comment) for comment in data["comments"]]
+        for pr_data in data["associated_prs"].values():
+            pr = PullRequestRecord.from_dict(pr_data, store)
+            issue.associated_prs[pr.number] = pr
+        return issue
+
+    def to_dict(self):
+        return {
+            "number": self.number,
+            "title": self.title,
+            "url": self.url,
+            "state": self.state,
+            "comments": self.comments,
+            "associated_prs": self.associated_prs
+        }
@@ -0,0 +1,206 @@
+"""
+Pre-flight cost and runtime planner (`python main.py --plan`).
+
+Makes a cheap metadata-only pass over the milestone (issue comments, linked
+PRs and the commit/line/file counts GitHub already reports on each PR, with
+no diffs, reviews or LLM calls) and estimates what a full run will cost.
+"""
+import math
+
+from llm_agent.prompts import COMMIT_ANALYSIS_PROMPT, PR_ANALYSIS_PROMPT, MILESTONE_ANALYSIS_PROMPT
+from utils.sampling import HIGH_RISK_FRACTION
+
+GITHUB_PAGE_SIZE = 30            # PyGithub's default per_page
+SEARCH_REQUESTS_PER_MINUTE = 30  # GitHub search API limit for authenticated users
+CORE_REQUESTS_PER_HOUR = 5000
+
+# Rough sizes used to approximate prompt content we don't fetch in the planning pass.
+CHARS_PER_TOKEN = 4
+AVG_DIFF_LINE_CHARS = 60
+DIFF_FILE_HEADER_CHARS = 80
+AVG_COMMIT_MESSAGE_CHARS = 120
+AVG_REVIEW_TEXT_CHARS = 400
+AVG_INLINE_COMMENT_CHARS = 200
+AVG_PR_COMMENT_TEXT_CHARS = 400
+PR_PROMPT_CHARS_PER_COMMIT = 360      # SHA, subject, 200-char diff snippet and score
+MILESTONE_PROMPT_CHARS_PER_ISSUE = 250
+MILESTONE_PROMPT_CHARS_PER_PR = 700
+MILESTONE_PROMPT_CHARS_PER_COMMIT = 90
+OUTPUT_TOKENS_PER_CALL = 300
+
+# Latency model for wall-time estimates.
+SECONDS_PER_GITHUB_REQUEST = 0.3
+LLM_SECONDS_PER_CALL = 2.0
+LLM_SECONDS_PER_1K_PROMPT_TOKENS = 0.4
+LLM_OUTPUT_TOKENS_PER_SECOND = 100
+
+TOP_COST_ITEMS = 5
+
+
+def estimate_tokens(chars):
+    return math.ceil(chars / CHARS_PER_TOKEN)
+
+
+def _pages(count):
+    return max(1, math.ceil(count / GITHUB_PAGE_SIZE))
+
+
+def collect_plan_metadata(github_client, issues):
+    """
+    Fetches only the metadata needed for planning: issue comments and linked
+    PRs. Commit, line and file counts come from the PR objects themselves.
+    A PR linked from several issues is analyzed once (see utils.work_graph),
+    so it is only listed under the first issue and counted in "shared_prs" after that.
+    """
+    metadata = []
+    seen_prs = set()
+    for issue in issues:
+        print(f"  Planning Issue #{issue.number}: {issue.title}")
+        issue_comments = github_client.get_issue_comments(issue.number)
+        prs = []
+        shared_prs = 0
+        for pr in github_client.get_linked_pull_requests(issue.number, issue_comments):
+            if pr.number in seen_prs:
+                shared_prs += 1
+                continue
+            seen_prs.add(pr.number)
+            prs.append({
+                "number": pr.number,
+                "title": pr.title,
+                "state": pr.state,
+                "commits": pr.commits,
+                "additions": pr.additions,
+                "deletions": pr.deletions,
+                "changed_files": pr.changed_files,
+                "review_comments": pr.review_comments,
+                "comments": pr.comments,
+                "description_chars": len(pr.body or "")
+            })
+        metadata.append({
+            "number": issue.number,
+            "title": issue.title,
+            "comments": len(issue_comments),
+            "prs": prs,
+            "shared_prs": shared_prs
+        })
+    return metadata
+
+
+def _estimate_pr(pr, sample_rate):
+    """
+    Estimates LLM calls, prompt tokens and GitHub requests for one PR.
+    """
+    commits = pr["commits"]
+    diff_lines = pr["additions"] + pr["deletions"]
+    commit_diff_chars = (diff_lines * AVG_DIFF_LINE_CHARS + pr["changed_files"] * DIFF_FILE_HEADER_CHARS) / max(commits, 1)
+    # Commit prompts carry only the inline review comments on that commit.
+    commit_review_chars = pr["review_comments"] * AVG_INLINE_COMMENT_CHARS / max(commits, 1)
+    commit_prompt_chars = len(COMMIT_ANALYSIS_PROMPT) + AVG_COMMIT_MESSAGE_CHARS + commit_diff_chars + commit_review_chars
+
+    commit_calls = commits
+    if sample_rate is not None and commits:
+        commit_calls = min(commits, max(1, math.ceil(sample_rate * commits)) + math.ceil(HIGH_RISK_FRACTION * commits))
+
+    pr_prompt_chars = (len(PR_ANALYSIS_PROMPT) + pr["description_chars"] + commit_calls * PR_PROMPT_CHARS_PER_COMMIT
+                       + AVG_REVIEW_TEXT_CHARS + AVG_PR_COMMENT_TEXT_CHARS)
+    prompt_tokens = estimate_tokens(commit_calls * commit_prompt_chars + pr_prompt_chars)
+
+    # commits list + one get_commit per commit + reviews + inline review comments + general comments
+    core_requests = _pages(commits) + commits + 2 * _pages(pr["review_comments"]) + _pages(pr["comments"])
+    return {
+        "number": pr["number"],
+        "title": pr["title"],
+        "commits": commits,
+        "diff_lines": diff_lines,
+        "llm_calls": commit_calls + 1,
+        "prompt_tokens": prompt_tokens,
+        "github_core_requests": core_requests
+    }
+
+
+def estimate_plan(milestone_title, metadata, sample_rate=None, concurrency=1, precheck_enabled=False):
+    """
+    Turns planning metadata into request, call, token and wall-time estimates,
+    and lists the PRs that dominate the cost.
+
+    The metadata has no diffs, so commits the pre-check will score without
+    the LLM can't be identified. With `precheck_enabled`, LLM calls, tokens
+    and wall time are upper bounds.
+    """
+    issue_count = len(metadata)
+    pr_estimates = [_estimate_pr(pr, sample_rate) for issue in metadata for pr in issue["prs"]]
+
+    # milestone lookup (main + client) and the issue list
+    core_requests = 2 + _pages(issue_count)
+    search_requests = 0
+    for issue in metadata:
+        # get_issue + comment pages + one get_pull per linked PR
+        linked_prs = len(issue["prs"]) + issue.get("shared_prs", 0)
+        core_requests += 1 + _pages(issue["comments"]) + linked_prs
+        search_requests += _pages(linked_prs)
+    core_requests += sum(pr["github_core_requests"] for pr in pr_estimates)
+
+    commit_count = sum(pr["commits"] for pr in pr_estimates)
+    milestone_prompt_chars = (len(MILESTONE_ANALYSIS_PROMPT) + issue_count * MILESTONE_PROMPT_CHARS_PER_ISSUE
+                              + len(pr_estimates) * MILESTONE_PROMPT_CHARS_PER_PR + commit_count * MILESTONE_PROMPT_CHARS_PER_COMMIT)
+    milestone_tokens = estimate_tokens(milestone_prompt_chars)
+
+    llm_calls = sum(pr["llm_calls"] for pr in pr_estimates) + 1
+    prompt_tokens = sum(pr["prompt_tokens"] for pr in pr_estimates) + milestone_tokens
+    output_tokens = llm_calls * OUTPUT_TOKENS_PER_CALL
+
+    github_seconds = max(core_requests * SECONDS_PER_GITHUB_REQUEST, search_requests * 60 / SEARCH_REQUESTS_PER_MINUTE)
+    llm_seconds = (llm_calls * LLM_SECONDS_PER_CALL
+                   + prompt_tokens / 1000 * LLM_SECONDS_PER_1K_PROMPT_TOKENS
+                   + output_tokens / LLM_OUTPUT_TOKENS_PER_SECOND) / max(concurrency, 1)
+
+    dominant = sorted(pr_estimates, key=lambda pr: pr["prompt_tokens"], reverse=True)[:TOP_COST_ITEMS]
+    for pr in dominant:
+        pr["share_of_prompt_tokens"] = round(pr["prompt_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0
+
+    return {
+        "milestone_title": milestone_title,
+        "issues": issue_count,
+        "pull_requests": len(pr_estimates),
+        "commits": commit_count,
+        "diff_lines": sum(pr["diff_lines"] for pr in pr_estimates),
+        "sample_rate": sample_rate,
+        "precheck_enabled": precheck_enabled,
+        "github_requests": {
+            "core": core_requests,
+            "search": search_requests,
+            "core_share_of_hourly_limit": round(core_requests / CORE_REQUESTS_PER_HOUR, 3)
+        },
+        "llm_calls": llm_calls,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "concurrency": concurrency,
+        "estimated_wall_seconds": round(github_seconds + llm_seconds),
+        "dominant_items": dominant
+    }
+
+
+def format_plan(plan):
+    """
+    Human-readable summary of an estimate_plan result.
+    """
+    lines = [f"--- Run Plan for Milestone: {plan['milestone_title']} (no LLM calls made) ---"]
+    lines.append(f"   Scope: {plan['issues']} issues, {plan['pull_requests']} PRs, {plan['commits']} commits, {plan['diff_lines']} diff lines")
+    if plan["sample_rate"] is not None:
+        lines.append(f"   Sampling: rate {plan['sample_rate']} (commit calls estimated from the sample size)")
+    requests = plan["github_requests"]
+    lines.append(f"   GitHub requests: ~{requests['core']} core ({requests['core_share_of_hourly_limit']:.0%} of the hourly limit), ~{requests['search']} search")
+    if plan.get("precheck_enabled"):
+        lines.append(f"   LLM calls: at most {plan['llm_calls']} (trivial commits are scored by the pre-check without the LLM; "
+                     "tokens and wall time are upper bounds too)")
+    else:
+        lines.append(f"   LLM calls: {plan['llm_calls']}")
+    lines.append(f"   Prompt tokens: ~{plan['prompt_tokens']:,} (output ~{plan['output_tokens']:,})")
+    minutes, seconds = divmod(plan["estimated_wall_seconds"], 60)
+    lines.append(f"   Expected wall time: ~{minutes}m {seconds}s at concurrency {plan['concurrency']}")
+    if plan["dominant_items"]:
+        lines.append("   Items dominating the cost:")
+        for pr in plan["dominant_items"]:
+            lines.append(f"     - PR #{pr['number']}: {pr['title'][:60]} - {pr['commits']} commits, {pr['diff_lines']} diff lines, "
+                         f"~{pr['prompt_tokens']:,} tokens ({pr['share_of_prompt_tokens']:.0%})")
+    return "\n".join(lines)
@@ -0,0 +1,345 @@
+"""
+Rule-based pre-classifier for trivial commits.
+
+Documentation-only changes, lockfile updates, version bumps, whitespace or
+formatting changes and pure renames don't need a full LLM review. Every file
+in the commit's diff (as produced by GitHubClient.get_commits_for_pull_request)
+is classified from its path and its added/removed lines. If every file falls
+into a trivial category, the commit gets a labeled heuristic analysis in the
+same shape as parse_llm_commit_analysis output, and no LLM call is made.
+
+Rules can be overridden with a JSON file named by PRECHECK_RULES_FILE, whose
+keys match PrecheckRules attributes. PRECHECK_ENABLED=false turns the
+pre-check off.
+"""
+import json
+import os
+import re
+from collections import Counter
+
+DEFAULT_RULES = {
+    "doc_extensions": [".md", ".rst", ".adoc"],
+    # Matched as a leading path prefix only
+    "doc_dirs": ["docs/", "doc/"],
+    # Matched on the file name without extension, e.g. README.txt, LICENSE
+    "doc_files": ["README", "CHANGELOG", "CHANGES", "LICENSE", "NOTICE", "CONTRIBUTING", "AUTHORS"],
+    # Files with these extensions are never treated as documentation, whatever their path or name.
+    "source_extensions": [
+        ".java", ".kt", ".kts", ".scala", ".groovy", ".py", ".js", ".jsx", ".ts", ".tsx", ".go", ".rs",
+        ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".rb", ".php", ".swift", ".m", ".sql", ".sh"
+    ],
+    # Whitespace changes in these files can change behavior, so they're never whitespace-only.
+    "whitespace_significant": [".py", ".yml", ".yaml", ".mk", "Makefile"],
+    "lockfiles": [
+        "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock",
+        "Cargo.lock", "go.sum", "Gemfile.lock", "composer.lock", "gradle.lockfile"
+    ],
+    "manifests": [
+        "pom.xml", "build.gradle", "build.gradle.kts", "gradle.properties", "package.json",
+        "setup.py", "setup.cfg", "pyproject.toml", "Cargo.toml", "VERSION", "version.txt"
+    ],
+    # Heuristic confidence score per category; the lowest applies to mixed commits.
+    "scores": {
+        "docs_only": 95,
+        "lockfile": 90,
+        "version_bump": 92,
+        "whitespace_only": 95,
+        "rename_only": 93
+    },
+    # Larger changes still go to the LLM even if they look trivial.
+    "max_changed_lines": 2000
+}
+
+CATEGORY_LABELS = {
+    "docs_only": "documentation-only change",
+    "lockfile": "lockfile update",
+    "version_bump": "version bump",
+    "whitespace_only": "whitespace/formatting-only change",
+    "rename_only": "rename without content change"
+}
+
+VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+(?:[-.][0-9A-Za-z]+)*")
+
+# The line that holds the project's own version, per manifest. Other manifests
+# use DEFAULT_VERSION_LINE (a top-level `version = ...` key). Dependency versions never match.
+VERSION_LINES = {
+    "pom.xml": re.compile(r"\s*<version>[^<]+</version>\s*"),
+    "package.json": re.compile(r'\s*"version"\s*:\s*"[^"]+"\s*,?\s*'),
+    "setup.py": re.compile(r"""\s*version\s*=\s*["'][^"']+["']\s*,?\s*"""),
+    "build.gradle": re.compile(r"""version\s*=?\s*["'][^"']+["']\s*"""),
+    "build.gradle.kts": re.compile(r"""version\s*=\s*["'][^"']+["']\s*"""),
+}
+DEFAULT_VERSION_LINE = re.compile(r"""version\s*[=:]\s*["']?[^"'\s]+["']?\s*""")
+# Files that hold nothing but the version.
+VERSION_FILES = ("VERSION", "version.txt")
+# TOML/INI sections a top-level version key belongs to the project in (not e.g. [dependencies.foo]).
+PROJECT_SECTIONS = ("project", "package", "tool.poetry", "metadata")
+SECTION_PATTERN = re.compile(r"\s*\[([^\]]+)\]\s*")
+
+
+class FileChange:
+    """
+    One file of a diff. `hunks` holds (op, text) lines per hunk, op being
+    " " (context), "-" or "+"; `added` and `removed` are the changed lines.
+    """
+    __slots__ = ("old_path", "new_path", "added", "removed", "hunks")
+
+    def __init__(self, old_path, new_path):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.added = []
+        self.removed = []
+        self.hunks = []
+
+
+def parse_diff(diff):
+    """
+    Splits a commit diff into FileChange entries with their hunks and added and removed lines.
+    """
+    files = []
+    current = None
+    old_path = None
+    for line in diff.splitlines():
+        if line.startswith("--- a/"):
+            old_path = line[6:]
+        elif line.startswith("+++ b/") and old_path is not None:
+            current = FileChange(old_path, line[6:])
+            files.append(current)
+            old_path = None
+        elif current is None or line.startswith("\\"):
+            continue
+        elif line.startswith("@@"):
+            current.hunks.append([])
+        elif not current.hunks:
+            continue
+        elif line.startswith("+"):
+            current.added.append(line[1:])
+            current.hunks[-1].append(("+", line[1:]))
+        elif line.startswith("-"):
+            current.removed.append(line[1:])
+            current.hunks[-1].append(("-", line[1:]))
+        else:
+            current.hunks[-1].append((" ", line[1:]))
+    return files
+
+
+def change_blocks(hunk):
+    """
+    Yields (removed, added) line lists for each run of changed lines between
+    context lines, so a removed line is only ever paired with the added lines
+    that replace it in place.
+    """
+    removed, added = [], []
+    for op, text in hunk:
+        if op == " " or (op == "-" and added):
+            if removed or added:
+                yield removed, added
+            removed, added = [], []
+        if op == "-":
+            removed.append(text)
+        elif op == "+":
+            added.append(text)
+    if removed or added:
+        yield removed, added
+
+
+class PrecheckRules:
+    def __init__(self, enabled=True, **overrides):
+        self.enabled = enabled
+        for key, default in DEFAULT_RULES.items():
+            value = overrides.get(key, default)
+            if isinstance(default, dict):
+                value = {**default, **value}
+            setattr(self, key, value)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Reads PRECHECK_ENABLED and the optional PRECHECK_RULES_FILE (JSON) overrides.
+        """
+        overrides = {}
+        rules_file = os.getenv("PRECHECK_RULES_FILE")
+        if rules_file:
+            with open(rules_file, encoding='utf-8') as f:
+                overrides = json.load(f)
+            unknown = set(overrides) - set(DEFAULT_RULES)
+            if unknown:
+                raise ValueError(f"Unknown pre-check rule(s) in {rules_file}: {', '.join(sorted(unknown))}")
+        enabled = os.getenv("PRECHECK_ENABLED", "true").lower() in ("1", "true", "yes")
+        return cls(enabled, **overrides)
+
+    def is_doc(self, path):
+        if any(path.lower().endswith(ext) for ext in self.source_extensions):
+            return False
+        name = path.rsplit("/", 1)[-1]
+        return (
+            any(path.lower().endswith(ext) for ext in self.doc_extensions)
+            or any(path.startswith(d) for d in self.doc_dirs)
+            or name.split(".", 1)[0].upper() in self.doc_files
+        )
+
+    def is_lockfile(self, path):
+        return path.rsplit("/", 1)[-1] in self.lockfiles
+
+    def is_manifest(self, path):
+        return path.rsplit("/", 1)[-1] in self.manifests
+
+    def is_whitespace_significant(self, path):
+        return any(path.endswith(suffix) for suffix in self.whitespace_significant)
+
+
+def _tokens(lines):
+    # Whitespace may change in amount, but not appear or disappear between tokens.
+    return [line.split() for line in lines if line.strip()]
+
+
+def is_whitespace_only(change):
+    """
+    True if every run of changed lines keeps the same tokens, line by line, as the lines it replaces.
+    Moved or reordered lines end up in different runs and don't count.
+    """
+    return all(_tokens(removed) == _tokens(added) for hunk in change.hunks for removed, added in change_blocks(hunk))
+
+
+def _indent(text):
+    return len(text.expandtabs(4)) - len(text.lstrip())
+
+
+def _in_project_scope(name, hunk, index):
+    """
+    Checks, from the context lines above hunk[index], that a version line
+    belongs to the project itself rather than to a dependency or parent.
+    """
+    context = [text for op, text in reversed(hunk[:index]) if op == " " and text.strip()]
+    if name == "pom.xml":
+        indent = _indent(hunk[index][1])
+        for text in context:
+            if _indent(text) < indent:
+                return text.lstrip().startswith("<project")
+        # No enclosing tag in sight: only a first-level element can be the project version.
+        return indent <= 4
+    if name.endswith((".toml", ".cfg")):
+        for text in context:
+            section = SECTION_PATTERN.fullmatch(text)
+            if section:
+                return section.group(1).strip() in PROJECT_SECTIONS
+    return True
+
+
+def is_version_bump(change):
+    """
+    True if the only changed lines are the project's own version (see
+    VERSION_LINES), with nothing but the version number different.
+    """
+    name = change.new_path.rsplit("/", 1)[-1]
+    added = [line for line in change.added if line.strip()]
+    removed = [line for line in change.removed if line.strip()]
+    if not added or len(added) != len(removed):
+        return False
+    for hunk in change.hunks:
+        for index, (op, text) in enumerate(hunk):
+            if op == " " or not text.strip():
+                continue
+            if name in VERSION_FILES:
+                if not VERSION_PATTERN.fullmatch(text.strip()):
+                    return False
+            elif (not VERSION_LINES.get(name, DEFAULT_VERSION_LINE).fullmatch(text)
+                    or not VERSION_PATTERN.search(text)
+                    or not _in_project_scope(name, hunk, index)):
+                return False
+    return _normalize_versions(added) == _normalize_versions(removed)
+
+
+def _normalize_versions(lines):
+    return sorted(VERSION_PATTERN.sub("<version>", line).strip() for line in lines)
+
+
+def classify_file(change, rules):
+    """
+    Returns the trivial category of one file change, or None if it needs a real review.
+    """
+    if not change.added and not change.removed:
+        return "rename_only" if change.old_path != change.new_path else None
+    if rules.is_doc(change.new_path):
+        return "docs_only"
+    if rules.is_lockfile(change.new_path):
+        return "lockfile"
+    if not rules.is_whitespace_significant(change.new_path) and is_whitespace_only(change):
+        return "whitespace_only"
+    if rules.is_manifest(change.new_path) and is_version_bump(change):
+        return "version_bump"
+    return None
+
+
+def classify_commit(commit, rules):
+    """
+    Returns a Counter of trivial categories per file if every file in the commit
+    is trivial, otherwise None.
+    """
+    changes = parse_diff(commit.diff)
+    if not changes:
+        return None
+    # Files without a patch in the diff (e.g. binaries) can't be checked, unless they're docs.
+    diffed_paths = {change.new_path for change in changes}
+    if any(path not in diffed_paths and not rules.is_doc(path) for path in commit.files):
+        return None
+    if sum(len(change.added) + len(change.removed) for change in changes) > rules.max_changed_lines:
+        return None
+
+    categories = Counter()
+    for change in changes:
+        category = classify_file(change, rules)
+        if category is None:
+            return None
+        categories[category] += 1
+    return categories
+
+
+def heuristic_analysis(categories, rules):
+    """
+    Builds an analysis in the parse_llm_commit_analysis shape, labeled as heuristic.
+    """
+    description = ", ".join(f"{CATEGORY_LABELS[category]} ({count} file{'s' if count > 1 else ''})"
+                            for category, count in sorted(categories.items()))
+    return {
+        "confidence_score": min(rules.scores[category] for category in categories),
+        "justification": f"[Heuristic pre-check, no LLM call] Trivial commit: {description}.",
+        "actionable_improvements": [],
+        "heuristic": sorted(categories)
+    }
+
+
+class CommitPrecheck:
+    """
+    Applies the rules to commits and counts the LLM calls skipped.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.stats = {"commits_checked": 0, "llm_calls_skipped": 0, "by_category": Counter()}
+
+    @classmethod
+    def from_env(cls):
+        return cls(PrecheckRules.from_env())
+
+    def check(self, commit):
+        """
+        Sets a heuristic `llm_analysis` on `commit` if it is trivial. Returns True if so.
+        """
+        if not self.rules.enabled:
+            return False
+        self.stats["commits_checked"] += 1
+        categories = classify_commit(commit, self.rules)
+        if categories is None:
+            return False
+        commit.llm_analysis = heuristic_analysis(categories, self.rules)
+        self.stats["llm_calls_skipped"] += 1
+        self.stats["by_category"].update(categories.keys())
+        return True
+
+    def summary(self):
+        return {
+            "commits_checked": self.stats["commits_checked"],
+            "llm_calls_skipped": self.stats["llm_calls_skipped"],
+            "by_category": dict(self.stats["by_category"])
+        }
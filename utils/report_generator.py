@@ -1,6 +1,7 @@
 def generate_console_report(analysis_data):
     """
     Generates a human-readable console report from the aggregated analysis data.
+    `analysis_data["issues"]` maps issue numbers to utils.models.IssueRecord objects.
     """
     report_lines = []
     
@@ -8,6 +9,58 @@ def generate_console_report(analysis_data):
     report_lines.append(f"--- Release Readiness Report for Milestone: {milestone_title} ---")
     report_lines.append("-" * (len(milestone_title) + 40))
 
+    llm_call_stats = analysis_data.get("llm_call_stats", {})
+    if llm_call_stats.get("failures") or llm_call_stats.get("retries") or llm_call_stats.get("hedges"):
+        report_lines.append(f"\nLLM calls: {llm_call_stats.get('calls')} calls, {llm_call_stats.get('retries')} retries, "
+                            f"{llm_call_stats.get('hedges')} hedged ({llm_call_stats.get('hedge_wins')} hedge wins), "
+                            f"{llm_call_stats.get('failures')} failed, {llm_call_stats.get('circuit_rejections')} rejected by circuit breaker.")
+
+    stream_stats = analysis_data.get("llm_stream_stats", {})
+    for kind, timings in stream_stats.items():
+        if timings.get("total_time"):
+            first_token = timings.get("time_to_first_token") or {}
+            to_score = timings.get("time_to_score") or {}
+            report_lines.append(f"\nLLM {kind} calls: {timings['calls']} calls, avg {timings['total_time']['avg']}s end-to-end "
+                                f"(first token {first_token.get('avg', 'N/A')}s, score {to_score.get('avg', 'N/A')}s), "
+                                f"{timings['early_cutoffs']} cut off early, ~{timings['avg_output_chars']} output chars per call.")
+
+    precheck = analysis_data.get("precheck", {})
+    if precheck.get("llm_calls_skipped"):
+        report_lines.append(f"\nPre-check: {precheck['llm_calls_skipped']} of {precheck['commits_checked']} commits classified as trivial and scored "
+                            "heuristically without an LLM call (" + ", ".join(f"{category}: {count}" for category, count in precheck["by_category"].items()) + ").")
+
+    commit_prompt_size = analysis_data.get("commit_prompt_size", {})
+    if commit_prompt_size:
+        report_lines.append(f"\nCommit prompts: avg {commit_prompt_size['avg_chars']} chars over {commit_prompt_size['commits']} commits "
+                            f"with per-commit review comments (vs {commit_prompt_size['avg_chars_all_pr_reviews']} chars with all PR reviews attached).")
+
+    work_graph = analysis_data.get("work_graph", {})
+    if work_graph.get("duplicate_prs_removed") or work_graph.get("duplicate_commits_removed"):
+        report_lines.append(f"\nWork graph: {work_graph.get('pull_requests')} unique PRs and {work_graph.get('commits')} unique commits; "
+                            f"{work_graph.get('duplicate_prs_removed')} duplicate PR and {work_graph.get('duplicate_commits_removed')} "
+                            "duplicate commit fetches/analyses avoided (shared results appear under every linking issue).")
+
+    sampling = analysis_data.get("sampling", {})
+    if sampling:
+        report_lines.append(f"\nSampling mode: {sampling.get('commits_sampled')}/{sampling.get('commits_total')} commits scored "
+                            f"(rate {sampling.get('sample_rate')}, {sampling.get('high_risk_commits')} high-risk or pre-classified commits always included).")
+        estimate = sampling.get("estimated_commit_score")
+        if estimate:
+            report_lines.append(f"   Estimated mean commit score: {estimate['mean']} "
+                                f"(95% CI {estimate['ci_low']}-{estimate['ci_high']}, stated error +/-{sampling.get('stated_error')})")
+
+    failed_issues = analysis_data.get("failed_issues", [])
+    if failed_issues:
+        report_lines.append(f"\n*** {len(failed_issues)} issue(s) could not be fetched and are excluded from this report: "
+                            + ", ".join(f"#{failed['number']}" for failed in failed_issues) + " ***")
+
+    coverage = analysis_data.get("coverage", {})
+    if coverage.get("partial"):
+        report_lines.append(f"\n*** PARTIAL REPORT: {coverage.get('coverage_ratio', 0):.0%} of commit/PR analyses completed "
+                            f"({coverage.get('commits_analyzed')}/{coverage.get('commits_total')} commits, "
+                            f"{coverage.get('prs_analyzed')}/{coverage.get('prs_total')} PRs). "
+                            "Items marked NOT ANALYZED were skipped by the time budget or failed. ***")
+
     # Add Milestone-level LLM Analysis at the top of the report
     milestone_llm_analysis = analysis_data.get("llm_milestone_analysis", {})
     if milestone_llm_analysis:
@@ -34,54 +87,66 @@ def generate_console_report(analysis_data):
         return "\n".join(report_lines)
 
     for issue_number, issue_data in issues.items():
-        report_lines.append(f"\n## Issue #{issue_data.get('number')}: {issue_data.get('title')}")
-        report_lines.append(f"   Status: {issue_data.get('state').capitalize()}")
-        report_lines.append(f"   URL: {issue_data.get('url')}")
+        report_lines.append(f"\n## Issue #{issue_data.number}: {issue_data.title}")
+        report_lines.append(f"   Status: {issue_data.state.capitalize()}")
+        report_lines.append(f"   URL: {issue_data.url}")
         
-        comments = issue_data.get("comments", [])
+        comments = issue_data.comments
         if comments:
             report_lines.append("   Issue Comments:")
             for comment in comments:
-                report_lines.append(f"     - {comment.get('user')}: {comment.get('body', '')[:100]}{'...' if len(comment.get('body', '')) > 100 else ''}") # Truncate long comments
+                report_lines.append(f"     - {comment.user}: {comment.body[:100]}{'...' if len(comment.body) > 100 else ''}") # Truncate long comments
         
-        associated_prs = issue_data.get("associated_prs", {})
+        associated_prs = issue_data.associated_prs
         if not associated_prs:
             report_lines.append("   No associated Pull Requests.")
         else:
             report_lines.append("\n   Associated Pull Requests:")
             for pr_number, pr_data in associated_prs.items():
-                report_lines.append(f"   --- PR #{pr_data.get('number')}: {pr_data.get('title')} ---")
-                report_lines.append(f"     URL: {pr_data.get('url')}")
-                report_lines.append(f"     Status: {pr_data.get('state').capitalize()}")
-                report_lines.append(f"     Author: {pr_data.get('user')}")
+                report_lines.append(f"   --- PR #{pr_data.number}: {pr_data.title} ---")
+                report_lines.append(f"     URL: {pr_data.url}")
+                report_lines.append(f"     Status: {pr_data.state.capitalize()}")
+                report_lines.append(f"     Author: {pr_data.user}")
                 # Properly truncate description and handle missing description
-                description = pr_data.get('description', 'No description provided.')
-                report_lines.append(f"     Description: {description.splitlines()[0][:100]}{'...' if len(description.splitlines()[0]) > 100 else ''}")
+                description_line = pr_data.description.splitlines()[0] if pr_data.description else 'No description provided.'
+                report_lines.append(f"     Description: {description_line[:100]}{'...' if len(description_line) > 100 else ''}")
 
 
                 # PR-Level LLM Analysis
-                pr_llm_analysis = pr_data.get("llm_pr_analysis", {})
+                pr_llm_analysis = pr_data.llm_pr_analysis
                 if pr_llm_analysis:
                     report_lines.append("\n     --- PR LLM Analysis ---")
                     score = pr_llm_analysis.get("release_readiness_score")
                     report_lines.append(f"     Release Readiness Score: {score}/100")
-                    report_lines.append(f"     Justification:\n       {pr_llm_analysis.get('justification', '').replace('\n', '\n       ')}")
+                    pr_justification = pr_llm_analysis.get('justification', '').replace('\n', '\n       ')
+                    report_lines.append(f"     Justification:\n       {pr_justification}")
                     
                     improvements = pr_llm_analysis.get("actionable_improvements", [])
                     if improvements:
                         report_lines.append("     Actionable Improvements:")
                         for imp in improvements:
                             report_lines.append(f"       - {imp}")
+                elif pr_data.analysis_status == "not_analyzed":
+                    report_lines.append("\n     PR LLM Analysis: NOT ANALYZED (time budget exhausted)")
+                elif pr_data.analysis_status == "llm_failed":
+                    report_lines.append("\n     PR LLM Analysis: NOT ANALYZED (LLM call failed)")
+                elif pr_data.analysis_status == "error":
+                    report_lines.append("\n     PR LLM Analysis: NOT ANALYZED (error during analysis)")
                 else:
                     report_lines.append("\n     No PR-level LLM analysis available.")
 
+                estimate = pr_data.commit_score_estimate
+                if estimate and estimate["commits_scored"] < estimate["commits_total"]:
+                    report_lines.append(f"     Estimated Commit Score ({estimate['commits_scored']}/{estimate['commits_total']} sampled): "
+                                        f"{estimate['mean']} (95% CI {estimate['ci_low']}-{estimate['ci_high']})")
+
                 # Commit-Level LLM Analysis (summarized)
-                commits = pr_data.get("commits", [])
+                commits = pr_data.commits
                 if commits:
                     report_lines.append("\n     --- Commit-Level Analysis Summary ---")
                     for commit in commits:
-                        report_lines.append(f"     Commit: {commit.get('sha', '')[:7]} - {commit.get('message', '').splitlines()[0]}")
-                        commit_llm_analysis = commit.get("llm_analysis", {})
+                        report_lines.append(f"     Commit: {commit.sha[:7]} - {commit.subject}")
+                        commit_llm_analysis = commit.llm_analysis
                         if commit_llm_analysis:
                             report_lines.append(f"       Confidence Score: {commit_llm_analysis.get('confidence_score', 'N/A')}")
                             
@@ -94,22 +159,30 @@ def generate_console_report(analysis_data):
                                 # Join and truncate suggestions more robustly
                                 joined_suggestions = "; ".join(suggestions)
                                 report_lines.append(f"       Actionable Improvements: {joined_suggestions[:150]}{'...' if len(joined_suggestions) > 150 else ''}")
+                        elif commit.analysis_status == "not_analyzed":
+                            report_lines.append("       NOT ANALYZED (time budget exhausted)")
+                        elif commit.analysis_status == "llm_failed":
+                            report_lines.append("       NOT ANALYZED (LLM call failed)")
+                        elif commit.analysis_status == "error":
+                            report_lines.append("       NOT ANALYZED (error during analysis)")
+                        elif commit.analysis_status == "not_sampled":
+                            report_lines.append("       NOT SAMPLED (covered by the PR's estimated commit score)")
                         else:
                             report_lines.append("       No commit-level LLM analysis.")
                 else:
                     report_lines.append("\n     No commits found for this PR.")
                 
-                reviews = pr_data.get("reviews", [])
+                reviews = pr_data.reviews
                 if reviews:
                     report_lines.append("\n     Reviews:")
                     for review in reviews:
-                        report_lines.append(f"       - {review.get('user')} ({review.get('state')}): {review.get('body', '')[:100]}{'...' if len(review.get('body', '')) > 100 else ''}")
+                        report_lines.append(f"       - {review.user} ({review.state}): {review.body[:100]}{'...' if len(review.body) > 100 else ''}")
                 
-                general_comments = pr_data.get("comments", [])
+                general_comments = pr_data.comments
                 if general_comments:
                     report_lines.append("\n     General PR Comments:")
                     for comment in general_comments:
-                        report_lines.append(f"       - {comment.get('user')}: {comment.get('body', '')[:100]}{'...' if len(comment.get('body', '')) > 100 else ''}")
+                        report_lines.append(f"       - {comment.user}: {comment.body[:100]}{'...' if len(comment.body) > 100 else ''}")
                 
                 report_lines.append("\n" + "-" * 50 + "\n") # Separator for PRs
     
@@ -0,0 +1,212 @@
+import math
+import random
+from collections import Counter, defaultdict
+
+from utils.scheduler import iter_pull_requests, iter_commits, STATUS_ANALYZED, STATUS_NOT_SAMPLED
+
+# The riskiest fraction of the milestone's commits (by utils.scheduler.estimate_commit_risk)
+# is always analyzed in full.
+HIGH_RISK_FRACTION = 0.05
+# Diff size buckets (in lines) used as one stratification dimension.
+DIFF_SIZE_BUCKETS = ((50, "small"), (300, "medium"))
+Z_95 = 1.96
+
+
+def diff_size_bucket(commit):
+    for limit, label in DIFF_SIZE_BUCKETS:
+        if commit.diff_lines < limit:
+            return label
+    return "large"
+
+
+def file_area(commit):
+    """
+    The top-level directory most of the commit's files live in.
+    """
+    if not commit.files:
+        return "(none)"
+    areas = Counter(path.split("/", 1)[0] if "/" in path else "(root)" for path in commit.files)
+    return areas.most_common(1)[0][0]
+
+
+def stratum_key(commit):
+    return (diff_size_bucket(commit), file_area(commit))
+
+
+def _estimation_key(commit, high_risk):
+    # High-risk commits are always analyzed, so they form their own (certainty) stratum.
+    if commit in high_risk:
+        return ("high_risk",)
+    return stratum_key(commit)
+
+
+def select_high_risk(issues_data, fraction=HIGH_RISK_FRACTION):
+    """
+    Returns the top `fraction` of the milestone's commits by risk score.
+    """
+    ranked = sorted(iter_commits(issues_data), key=lambda commit: commit.risk_score or 0, reverse=True)
+    return {commit for commit in ranked[:math.ceil(fraction * len(ranked))] if commit.risk_score}
+
+
+def _allocate(strata, sample_size):
+    """
+    Splits `sample_size` across strata proportionally to their size (largest remainder).
+    """
+    total = sum(len(members) for members in strata.values())
+    quotas = {key: sample_size * len(members) / total for key, members in strata.items()}
+    allocation = {key: int(quota) for key, quota in quotas.items()}
+    leftover = sample_size - sum(allocation.values())
+    for key in sorted(quotas, key=lambda k: quotas[k] - allocation[k], reverse=True)[:leftover]:
+        allocation[key] += 1
+    return allocation
+
+
+def select_sample(issues_data, sample_rate, high_risk, seed=0):
+    """
+    Picks the commits to analyze in sampling mode and marks the rest as not sampled.
+
+    Per PR, commits in `high_risk` (see select_high_risk) are always kept. The
+    remaining commits are grouped into strata by diff size and file area, and
+    ceil(sample_rate * N) of them (at least one per PR) are drawn, allocated
+    proportionally across strata. Expects risk scores from
+    utils.scheduler.build_analysis_queue. Returns the set of sampled commits.
+    """
+    rng = random.Random(seed)
+    sampled = set()
+    for pr in iter_pull_requests(issues_data):
+        strata = defaultdict(list)
+        for commit in pr.commits:
+            if commit in high_risk:
+                sampled.add(commit)
+            else:
+                strata[stratum_key(commit)].append(commit)
+
+        candidates = sum(len(members) for members in strata.values())
+        if not candidates:
+            continue
+        sample_size = min(candidates, max(1, math.ceil(sample_rate * candidates)))
+        for key, count in _allocate(strata, sample_size).items():
+            sampled.update(rng.sample(strata[key], count))
+
+    for commit in iter_commits(issues_data):
+        if commit not in sampled:
+            commit.analysis_status = STATUS_NOT_SAMPLED
+    return sampled
+
+
+def _score(commit):
+    return commit.llm_analysis.get("confidence_score") if commit.analysis_status == STATUS_ANALYZED else None
+
+
+def _stratum_stats(scores):
+    n = len(scores)
+    mean = sum(scores) / n
+    variance = sum((s - mean) ** 2 for s in scores) / (n - 1) if n > 1 else None
+    return mean, variance
+
+
+def _interval(mean, variance, sampled, total):
+    half_width = Z_95 * math.sqrt(max(variance, 0.0))
+    return {
+        "mean": round(mean, 1),
+        "ci_low": round(max(0.0, mean - half_width), 1),
+        "ci_high": round(min(100.0, mean + half_width), 1),
+        "confidence_level": 0.95,
+        "commits_scored": sampled,
+        "commits_total": total
+    }
+
+
+def _stratified_estimate(commits, fallback_strata, pooled_variance, high_risk):
+    """
+    Stratified estimate of the mean commit score over one PR's `commits`.
+    Returns (mean, variance of the mean, commits scored).
+
+    High-risk (certainty) commits contribute exactly. Strata without any scored
+    commit borrow the milestone-wide stratum mean from `fallback_strata`.
+    Strata with a single scored commit use `pooled_variance`.
+    """
+    total = len(commits)
+    strata = defaultdict(list)
+    weighted_mean = variance = 0.0
+    scored = 0
+    for commit in commits:
+        strata[_estimation_key(commit, high_risk)].append(commit)
+
+    for key, members in strata.items():
+        scores = [s for s in (_score(c) for c in members) if s is not None]
+        weight = len(members) / total
+        if scores:
+            mean, stratum_variance = _stratum_stats(scores)
+            stratum_variance = pooled_variance if stratum_variance is None else stratum_variance
+            fpc = 1 - len(scores) / len(members)
+            variance += weight ** 2 * fpc * stratum_variance / len(scores)
+            scored += len(scores)
+        elif key in fallback_strata:
+            mean, stratum_variance, borrowed_n = fallback_strata[key]
+            variance += weight ** 2 * stratum_variance / borrowed_n
+        else:
+            # Nothing comparable was scored anywhere; assume the overall sample mean with pooled spread.
+            mean = fallback_strata["__all__"][0]
+            variance += weight ** 2 * pooled_variance
+        weighted_mean += weight * mean
+    return weighted_mean, variance, scored
+
+
+def estimate_scores(issues_data, high_risk):
+    """
+    Extrapolates commit scores from the analyzed sample.
+
+    Stores a 95% interval for the mean commit score on every PR
+    (`commit_score_estimate`) and returns the milestone-wide estimate,
+    or None when nothing was scored.
+
+    select_sample draws within each PR, so small PRs are sampled at a much
+    higher rate than large ones. The milestone estimate therefore combines
+    the per-PR estimates weighted by commit count (each PR is its own set of
+    strata) instead of pooling scored commits across PRs.
+    """
+    by_stratum = defaultdict(list)
+    for commit in iter_commits(issues_data):
+        score = _score(commit)
+        if score is not None:
+            by_stratum[_estimation_key(commit, high_risk)].append(score)
+    all_scores = [score for scores in by_stratum.values() for score in scores]
+    if not all_scores:
+        return None
+
+    overall_mean, pooled_variance = _stratum_stats(all_scores)
+    pooled_variance = pooled_variance or 0.0
+    fallback_strata = {"__all__": (overall_mean, pooled_variance, len(all_scores))}
+    for key, scores in by_stratum.items():
+        mean, variance = _stratum_stats(scores)
+        fallback_strata[key] = (mean, pooled_variance if variance is None else variance, len(scores))
+
+    total = sum(len(pr.commits) for pr in iter_pull_requests(issues_data))
+    milestone_mean = milestone_variance = 0.0
+    for pr in iter_pull_requests(issues_data):
+        if not pr.commits:
+            continue
+        mean, variance, scored = _stratified_estimate(pr.commits, fallback_strata, pooled_variance, high_risk)
+        pr.commit_score_estimate = _interval(mean, variance, scored, len(pr.commits))
+        weight = len(pr.commits) / total
+        milestone_mean += weight * mean
+        milestone_variance += weight ** 2 * variance
+    return _interval(milestone_mean, milestone_variance, len(all_scores), sum(1 for _ in iter_commits(issues_data)))
+
+
+def summarize_sampling(issues_data, sample_rate, sampled, high_risk):
+    """
+    Builds the "sampling" section of the results: sample rate, sample sizes
+    and the extrapolated milestone commit score with its interval.
+    """
+    commits_total = sum(1 for _ in iter_commits(issues_data))
+    estimate = estimate_scores(issues_data, high_risk)
+    return {
+        "sample_rate": sample_rate,
+        "commits_total": commits_total,
+        "commits_sampled": len(sampled),
+        "high_risk_commits": len(high_risk),
+        "estimated_commit_score": estimate,
+        "stated_error": round((estimate["ci_high"] - estimate["ci_low"]) / 2, 1) if estimate else None
+    }
@@ -0,0 +1,189 @@
+import time
+from collections import Counter
+
+# Risk weights used to rank analysis work. Higher risk items are analyzed first
+# so that a deadline-limited run still covers what matters most for go/no-go.
+OPEN_PR_WEIGHT = 3.0
+CHANGES_REQUESTED_WEIGHT = 2.0
+DIFF_LINES_PER_POINT = 200   # One risk point per 200 diff lines...
+MAX_DIFF_RISK = 3.0          # ...capped so a single huge diff doesn't dominate.
+HOT_FILE_WEIGHT = 0.5        # Per additional commit that touched the same file.
+MAX_HOT_FILE_RISK = 3.0
+
+STATUS_ANALYZED = "analyzed"
+STATUS_NOT_ANALYZED = "not_analyzed"
+STATUS_LLM_FAILED = "llm_failed"
+STATUS_NOT_SAMPLED = "not_sampled"
+STATUS_ERROR = "error"
+
+
+def iter_pull_requests(issues_data):
+    """
+    Yields every unique PullRequestRecord in the milestone results once,
+    even when several issues link to it (see utils.work_graph).
+    """
+    seen = set()
+    for issue in issues_data.values():
+        for pr in issue.associated_prs.values():
+            if pr not in seen:
+                seen.add(pr)
+                yield pr
+
+
+def iter_commits(issues_data):
+    """
+    Yields every unique CommitRecord in the milestone results once, even when stacked PRs share it.
+    """
+    seen = set()
+    for pr in iter_pull_requests(issues_data):
+        for commit in pr.commits:
+            if commit not in seen:
+                seen.add(commit)
+                yield commit
+
+
+def compute_file_churn(issues_data):
+    """
+    Counts how many commits in the milestone touch each file.
+    """
+    churn = Counter()
+    for commit in iter_commits(issues_data):
+        churn.update(set(commit.files))
+    return churn
+
+
+def estimate_commit_risk(commit, file_churn):
+    """
+    Estimates commit risk from its diff size and how often its files change.
+    """
+    diff_risk = min(commit.diff_lines / DIFF_LINES_PER_POINT, MAX_DIFF_RISK)
+    max_churn = max((file_churn.get(f, 0) for f in commit.files), default=0)
+    hot_file_risk = min(HOT_FILE_WEIGHT * max(max_churn - 1, 0), MAX_HOT_FILE_RISK)
+    return round(diff_risk + hot_file_risk, 3)
+
+
+def estimate_pr_risk(pr, commit_risks):
+    """
+    Estimates PR risk from its state, review outcome and the risk of its riskiest commit.
+    """
+    risk = max(commit_risks, default=0.0)
+    if pr.state == "open":
+        risk += OPEN_PR_WEIGHT
+    if pr.changes_requested:
+        risk += CHANGES_REQUESTED_WEIGHT
+    total_diff_lines = sum(commit.diff_lines for commit in pr.commits)
+    risk += min(total_diff_lines / DIFF_LINES_PER_POINT, MAX_DIFF_RISK)
+    return round(risk, 3)
+
+
+def build_analysis_queue(issues_data):
+    """
+    Builds the ordered list of analysis work units for the milestone.
+
+    PRs are ordered by descending risk. Within a PR, commits are ordered by
+    descending risk and the PR-level unit comes last, since its prompt includes
+    the commit scores. Every unique PR and commit gets exactly one unit; a
+    commit shared by several PRs is queued with the first (riskiest) of them,
+    which keeps the order topological. Each unit is a dict with "kind"
+    ("commit" or "pr"), "pr", "commit" (None for PR units) and "risk".
+    """
+    file_churn = compute_file_churn(issues_data)
+    groups = []
+    for pr in iter_pull_requests(issues_data):
+        commit_units = []
+        for commit in pr.commits:
+            commit.risk_score = estimate_commit_risk(commit, file_churn)
+            commit_units.append({"kind": "commit", "pr": pr, "commit": commit, "risk": commit.risk_score})
+        commit_units.sort(key=lambda unit: unit["risk"], reverse=True)
+
+        pr.risk_score = estimate_pr_risk(pr, [unit["risk"] for unit in commit_units])
+        groups.append((pr.risk_score, commit_units + [{"kind": "pr", "pr": pr, "commit": None, "risk": pr.risk_score}]))
+
+    groups.sort(key=lambda group: group[0], reverse=True)
+    queue = []
+    queued_commits = set()
+    for _, units in groups:
+        for unit in units:
+            if unit["commit"] is not None:
+                if unit["commit"] in queued_commits:
+                    continue
+                queued_commits.add(unit["commit"])
+            queue.append(unit)
+    return queue
+
+
+def run_analysis_queue(queue, handlers, deadline=None, on_error=None):
+    """
+    Runs work units in order until the queue is empty or the deadline is reached.
+
+    `handlers` maps a unit kind to a callable taking the unit. `deadline` is an
+    absolute time.monotonic() value (None means unlimited), so time spent
+    before the queue (e.g. fetching from GitHub) counts against the budget.
+    The average unit duration is held back so the milestone-level call that
+    follows still fits. A unit that raises is marked with STATUS_ERROR and
+    reported to `on_error(unit, error)`; the rest of the queue still runs.
+    Returns the number of units completed.
+    """
+    start = time.monotonic()
+    completed = 0
+    for unit in queue:
+        if deadline is not None:
+            now = time.monotonic()
+            reserve = (now - start) / completed if completed else 0.0
+            if now + reserve >= deadline:
+                print(f"\nDeadline reached after {completed} of {len(queue)} analysis units.")
+                break
+        try:
+            handlers[unit["kind"]](unit)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted after {completed} of {len(queue)} analysis units. Writing partial report...")
+            break
+        except Exception as e:
+            target = unit["commit"] if unit["commit"] is not None else unit["pr"]
+            target.analysis_status = STATUS_ERROR
+            print(f"Warning: {unit['kind']} analysis failed for PR #{unit['pr'].number}: {e}")
+            if on_error:
+                on_error(unit, e)
+        completed += 1
+    return completed
+
+
+def mark_analysis_status(issues_data):
+    """
+    Flags every commit and PR as analyzed or not, based on whether it has an LLM analysis.
+    Items already flagged as failed, or left out by sampling mode, keep that status.
+    """
+    for pr in iter_pull_requests(issues_data):
+        for commit in pr.commits:
+            if commit.analysis_status not in (STATUS_LLM_FAILED, STATUS_ERROR, STATUS_NOT_SAMPLED):
+                commit.analysis_status = STATUS_ANALYZED if commit.llm_analysis else STATUS_NOT_ANALYZED
+        if pr.analysis_status not in (STATUS_LLM_FAILED, STATUS_ERROR):
+            pr.analysis_status = STATUS_ANALYZED if pr.llm_pr_analysis else STATUS_NOT_ANALYZED
+
+
+def compute_coverage(issues_data, deadline=None):
+    """
+    Summarizes how much of the milestone was analyzed. Expects `mark_analysis_status` to have run.
+    Commits left out by sampling mode are counted separately and don't make the run partial.
+    """
+    commits_total = commits_analyzed = commits_not_sampled = prs_total = prs_analyzed = 0
+    for pr in iter_pull_requests(issues_data):
+        prs_total += 1
+        prs_analyzed += pr.analysis_status == STATUS_ANALYZED
+    for commit in iter_commits(issues_data):
+        commits_total += 1
+        commits_analyzed += commit.analysis_status == STATUS_ANALYZED
+        commits_not_sampled += commit.analysis_status == STATUS_NOT_SAMPLED
+
+    units_total = commits_total - commits_not_sampled + prs_total
+    units_analyzed = commits_analyzed + prs_analyzed
+    return {
+        "commits_analyzed": commits_analyzed,
+        "commits_total": commits_total,
+        "commits_not_sampled": commits_not_sampled,
+        "prs_analyzed": prs_analyzed,
+        "prs_total": prs_total,
+        "coverage_ratio": round(units_analyzed / units_total, 3) if units_total else 1.0,
+        "partial": units_analyzed < units_total,
+        "deadline_seconds": deadline
+    }
@@ -0,0 +1,68 @@
+"""
+Milestone work graph of issues, PRs and commits.
+
+The same PR can be linked from several issues, and the same commit can appear
+in stacked PRs. WorkGraph keeps one canonical record per PR number and commit
+SHA. Each PR and commit is therefore fetched and analyzed exactly once, and
+the shared record (with its analysis) is attached to every parent.
+utils.scheduler.build_analysis_queue then visits the unique nodes in
+topological order: commits before the PRs that contain them, and PRs before
+the milestone.
+"""
+
+
+class WorkGraph:
+    def __init__(self):
+        self.prs = {}
+        self.commits = {}
+        self.issue_count = 0
+        self.linked_prs = set()
+        self.issue_pr_links = 0
+        self.pr_commit_links = 0
+        # Commit units as they would be counted without deduplication: one per (issue, PR, commit) path.
+        self.commit_paths = 0
+
+    def get_pr(self, number):
+        return self.prs.get(number)
+
+    def get_commit(self, sha):
+        return self.commits.get(sha)
+
+    def add_pr(self, pr):
+        """
+        Registers a PR, replacing its commit records with canonical ones where
+        the commit is already known. Returns the canonical PR record.
+        """
+        if pr.number in self.prs:
+            return self.prs[pr.number]
+        pr.commits = [self.commits.setdefault(commit.sha, commit) for commit in pr.commits]
+        self.pr_commit_links += len(pr.commits)
+        self.prs[pr.number] = pr
+        return pr
+
+    def add_issue(self, issue):
+        """
+        Registers a fetched or journal-restored issue and points its PR links at
+        the canonical records.
+        """
+        self.issue_count += 1
+        for number, pr in list(issue.associated_prs.items()):
+            canonical = self.add_pr(pr)
+            issue.associated_prs[number] = canonical
+            self.linked_prs.add(number)
+            self.issue_pr_links += 1
+            self.commit_paths += len(canonical.commits)
+
+    def stats(self):
+        """
+        Graph size and the duplicate fetch/analysis work removed by sharing nodes.
+        """
+        return {
+            "issues": self.issue_count,
+            "pull_requests": len(self.linked_prs),
+            "commits": len(self.commits),
+            "issue_pr_links": self.issue_pr_links,
+            "pr_commit_links": self.pr_commit_links,
+            "duplicate_prs_removed": self.issue_pr_links - len(self.linked_prs),
+            "duplicate_commits_removed": self.commit_paths - len(self.commits)
+        }